@@ -0,0 +1,112 @@
+"""Replays a recorded mouse input trace into an offscreen TimerView.
+
+Traces are recorded with ``python -m minimaltimer.app --record-input FILE``.
+Events are sent at their original pace or as fast as possible, and the
+per-event handling latency, engine updates and paints are reported as JSON:
+
+    python benchmarks/replay.py TRACE [--max-speed] [--no-throttle-drag]
+                                      [--time SECS] [--output FILE]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from qtpy.QtWidgets import QApplication
+from minimaltimer.countdown import NS_PER_MSEC
+from minimaltimer.inputtrace import InputTrace, MOVE, PRESS, RELEASE
+from minimaltimer.time import Time
+from minimaltimer.timerengine import TimerEngine
+from minimaltimer.timerview import TimerView
+from suite import PaintCounter, gitRevision, summarize
+
+KIND_NAMES = {PRESS: 'press', MOVE: 'move', RELEASE: 'release'}
+
+
+def replay(app: QApplication, trace: InputTrace, maxSpeed: bool,
+           throttleDrag: bool = None, secs: int = 0) -> dict:
+    engine = TimerEngine()
+    view = TimerView()
+    view.setEngine(engine)
+    if throttleDrag is not None:
+        # Otherwise the view keeps the drag coalescing it ships with.
+        view.setThrottleDrag(throttleDrag)
+    view.resize(trace.width, trace.height)
+    view.show()
+    app.processEvents()
+    engine.setTime(Time(secs))
+    app.processEvents()
+
+    updates = []
+    engine.timeValueChanged.connect(lambda time, oldTime: updates.append(time))
+    paints = PaintCounter()
+    view.installEventFilter(paints)
+
+    samples = {kind: [] for kind in KIND_NAMES}
+    lateness = []
+    start = time.perf_counter_ns()
+    for event in trace.events:
+        if not maxSpeed:
+            # Let timers and paints run while waiting, as a real event loop would.
+            while time.perf_counter_ns() - start < event[0]:
+                app.processEvents()
+            lateness.append((time.perf_counter_ns() - start - event[0]) / 1e9)
+        mouseEvent = InputTrace.toMouseEvent(event)
+        eventStart = time.perf_counter()
+        QApplication.sendEvent(view, mouseEvent)
+        samples[event[1]].append(time.perf_counter() - eventStart)
+        app.processEvents()
+    app.processEvents()
+    total = time.perf_counter_ns() - start
+
+    allSamples = [sample for kindSamples in samples.values() for sample in kindSamples]
+    result = dict(events=len(trace.events), size=[trace.width, trace.height],
+                  max_speed=maxSpeed, throttle_drag=view.throttleDrag(),
+                  recorded_ms=trace.duration() / NS_PER_MSEC,
+                  total_ms=total / NS_PER_MSEC,
+                  engine_updates=len(updates), paints=paints.count,
+                  final_msecs=engine.getTime().getMilliseconds())
+    if allSamples:
+        result['latency'] = summarize(allSamples)
+        result['latency_by_kind'] = {KIND_NAMES[kind]: summarize(kindSamples)
+                                     for kind, kindSamples in samples.items()
+                                     if kindSamples}
+    if lateness:
+        result['dispatch_lateness'] = summarize(lateness)
+    view.close()
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('trace', help='trace file written by --record-input')
+    parser.add_argument('--max-speed', action='store_true',
+                        help='send events back to back instead of at their recorded times')
+    parser.add_argument('--no-throttle-drag', dest='throttle_drag',
+                        action='store_const', const=False, default=None,
+                        help='send every drag event to the engine instead of '
+                             'one update per frame')
+    parser.add_argument('--time', type=int, default=0,
+                        help='countdown seconds when the replay starts')
+    parser.add_argument('--output', help='write JSON here instead of stdout')
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    result = replay(app, InputTrace.load(args.trace), args.max_speed,
+                    args.throttle_drag, args.time)
+    result['revision'] = gitRevision()
+    result['trace'] = os.path.basename(args.trace)
+    text = json.dumps(result, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+"""Cold start benchmark for minimaltimer.app.
+
+Starts the application in a fresh interpreter with ``-X importtime`` and
+reports the time from process launch to the first paint of the TimerView,
+together with the slowest imports, as JSON.
+
+    python benchmarks/startup.py [--runs N] [--output FILE]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def child() -> None:
+    from qtpy.QtCore import QEvent, QObject
+    from qtpy.QtWidgets import QApplication, QMainWindow
+    import minimaltimer.app
+    from minimaltimer.timerview import TimerView
+
+    class FirstPaintFilter(QObject):
+        def eventFilter(self, obj: QObject, event: QEvent) -> bool:
+            if event.type() == QEvent.Type.Paint and isinstance(obj, TimerView):
+                print('FIRST_PAINT', time.time(), flush=True)
+                QApplication.quit()
+            return False
+
+    paintFilter = FirstPaintFilter()
+
+    def ready(app: QApplication, win: QMainWindow) -> None:
+        app.installEventFilter(paintFilter)
+
+    # Keep the user's saved timer out of the measurement.
+    with tempfile.TemporaryDirectory() as stateDir:
+        sys.argv = sys.argv[:1] + ['--state', os.path.join(stateDir, 'timer.state')]
+        minimaltimer.app.main(ready)
+
+
+def parseImportTime(stderr: str) -> list:
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        selfUs, cumulativeUs, name = line.split(':', 1)[1].split('|')
+        imports.append({'module': name.strip(),
+                        'self_us': int(selfUs),
+                        'cumulative_us': int(cumulativeUs)})
+    return imports
+
+
+def run() -> dict:
+    env = dict(os.environ)
+    env.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [ROOT, env.get('PYTHONPATH')]))
+    started = time.time()
+    proc = subprocess.run([sys.executable, '-X', 'importtime', __file__, '--child'],
+                          env=env, capture_output=True, text=True, check=True)
+    painted = next(float(line.split()[1]) for line in proc.stdout.splitlines()
+                   if line.startswith('FIRST_PAINT'))
+    imports = parseImportTime(proc.stderr)
+    return {'first_paint_ms': (painted - started) * 1000,
+            'import_us': sum(item['self_us'] for item in imports),
+            'imports': imports}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--top', type=int, default=15)
+    parser.add_argument('--output', help='write JSON here instead of stdout')
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child()
+        return
+
+    runs = [run() for _ in range(args.runs)]
+    firstPaint = [r['first_paint_ms'] for r in runs]
+    slowest = sorted(runs[-1]['imports'], key=lambda item: item['cumulative_us'],
+                     reverse=True)[:args.top]
+    result = {
+        'benchmark': 'startup',
+        'runs': args.runs,
+        'first_paint_ms': {'min': min(firstPaint),
+                           'median': statistics.median(firstPaint),
+                           'max': max(firstPaint)},
+        'import_ms_median': statistics.median(r['import_us'] for r in runs) / 1000,
+        'slowest_imports': slowest,
+    }
+    text = json.dumps(result, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,216 @@
+"""Rendering, drag handling and engine tick benchmarks.
+
+Runs offscreen and writes machine-readable JSON that can be compared across
+commits:
+
+    python benchmarks/suite.py [--quick] [--output FILE]
+"""
+import argparse
+import json
+import os
+from math import cos, pi, sin
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from qtpy.QtCore import QEvent, QObject, QPoint, Qt
+from qtpy.QtGui import QMouseEvent
+from qtpy.QtWidgets import QApplication
+from minimaltimer.clock import VirtualClock
+from minimaltimer.countdown import NS_PER_MSEC
+from minimaltimer.time import Time
+from minimaltimer.timerengine import TimerEngine
+from minimaltimer.timerstore import TimerStore
+from minimaltimer.timerview import TimerView
+
+
+def summarize(samples: list) -> dict:
+    samples = sorted(samples)
+    return {'n': len(samples),
+            'min_us': samples[0] * 1e6,
+            'median_us': statistics.median(samples) * 1e6,
+            'p95_us': samples[int(len(samples) * 0.95) - 1] * 1e6,
+            'max_us': samples[-1] * 1e6}
+
+
+class PaintCounter(QObject):
+    def __init__(self) -> None:
+        super().__init__()
+        self.count = 0
+
+    def eventFilter(self, obj: QObject, event: QEvent) -> bool:
+        if event.type() == QEvent.Type.Paint:
+            self.count += 1
+        return False
+
+
+def makeView(app: QApplication, side: int) -> TimerView:
+    engine = TimerEngine()
+    view = TimerView()
+    view.setEngine(engine)
+    view.resize(side, side)
+    view.show()
+    app.processEvents()
+    engine.setTime(Time(1234))
+    return view
+
+
+def benchPaint(app: QApplication, sizes: list, frames: int) -> list:
+    results = []
+    for side in sizes:
+        view = makeView(app, side)
+        # Render every uncached frame instead of sharing faces across views.
+        view.setRenderCache(None)
+        for cached in (True, False):
+            samples = []
+            for _ in range(frames):
+                if not cached:
+                    view.invalidateFace()
+                start = time.perf_counter()
+                view.repaint()
+                samples.append(time.perf_counter() - start)
+            results.append(dict(size=side, face_cached=cached, **summarize(samples)))
+        view.close()
+    return results
+
+
+def benchDrag(app: QApplication, side: int, events: int) -> dict:
+    view = makeView(app, side)
+    changes = []
+    view._engine.timeChanged.connect(lambda: changes.append(None))
+    paints = PaintCounter()
+    view.installEventFilter(paints)
+
+    center = view.rect().center()
+    radius = view.getRadius() * 0.8
+    press = QMouseEvent(QEvent.Type.MouseButtonPress, center + QPoint(0, -10),
+                        Qt.MouseButton.LeftButton, Qt.MouseButton.LeftButton,
+                        Qt.KeyboardModifier.NoModifier)
+    QApplication.sendEvent(view, press)
+
+    samples = []
+    start = time.perf_counter()
+    for i in range(events):
+        angle = 2 * pi * (i % 720) / 720
+        pos = center + QPoint(int(radius * sin(angle)), int(-radius * cos(angle)))
+        event = QMouseEvent(QEvent.Type.MouseMove, pos, Qt.MouseButton.NoButton,
+                            Qt.MouseButton.LeftButton, Qt.KeyboardModifier.NoModifier)
+        eventStart = time.perf_counter()
+        QApplication.sendEvent(view, event)
+        samples.append(time.perf_counter() - eventStart)
+        if i % 8 == 7:
+            # Roughly one display frame worth of input between event loop runs.
+            app.processEvents()
+    app.processEvents()
+    total = time.perf_counter() - start
+
+    release = QMouseEvent(QEvent.Type.MouseButtonRelease, pos,
+                          Qt.MouseButton.LeftButton, Qt.MouseButton.NoButton,
+                          Qt.KeyboardModifier.NoModifier)
+    QApplication.sendEvent(view, release)
+    view.close()
+    return dict(size=side, events=events, total_ms=total * 1000,
+                engine_updates=len(changes), paints=paints.count,
+                **summarize(samples))
+
+
+def benchEngineTicks(counts: list, ticks: int) -> list:
+    results = []
+    for count in counts:
+        engines = [TimerEngine() for _ in range(count)]
+        for engine in engines:
+            engine.setTickInterval(1)
+            engine.setTime(Time(3600))
+        samples = []
+        for _ in range(ticks):
+            start = time.perf_counter()
+            for engine in engines:
+                engine.wake()
+            samples.append((time.perf_counter() - start) / count)
+        for engine in engines:
+            engine.pause()
+        results.append(dict(engines=count, ticks=ticks, **summarize(samples)))
+    return results
+
+
+def benchVirtualClock(counts: list, secs: int) -> list:
+    # Runs `secs` of simulated countdown on a VirtualClock, checking that
+    # every engine ticks once per second and times out exactly on time.
+    results = []
+    for count in counts:
+        clock = VirtualClock()
+        engines = [TimerEngine(clock=clock) for _ in range(count)]
+        timeouts = []
+        for engine in engines:
+            engine.timeout.connect(lambda: timeouts.append(clock.now()))
+            engine.setTime(Time(secs))
+        start = time.perf_counter()
+        callbacks = clock.advance(secs * 1000 * NS_PER_MSEC)
+        total = time.perf_counter() - start
+        drift = max((abs(t - secs * 1000 * NS_PER_MSEC) for t in timeouts), default=0)
+        results.append(dict(engines=count, simulated_s=secs, total_ms=total * 1000,
+                            ticks=sum(e.wakeupCount() for e in engines),
+                            callbacks=callbacks, timeouts=len(timeouts),
+                            max_drift_ms=drift / NS_PER_MSEC))
+    return results
+
+
+def benchTimerStore(counts: list, ticks: int) -> list:
+    # Cost of one store tick with every slot running, compare engine_ticks.
+    results = []
+    for count in counts:
+        clock = VirtualClock()
+        store = TimerStore(count, clock=clock)
+        for index in range(count):
+            store.add(Time(msecs=3600000 - index))
+        samples = []
+        for _ in range(ticks):
+            clock.advance(1000 * NS_PER_MSEC)
+            start = time.perf_counter()
+            store.tick()
+            samples.append((time.perf_counter() - start) / count)
+        results.append(dict(timers=count, ticks=ticks, **summarize(samples)))
+    return results
+
+
+def gitRevision() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--quick', action='store_true', help='fewer iterations')
+    parser.add_argument('--output', help='write JSON here instead of stdout')
+    args = parser.parse_args()
+    scale = 0.1 if args.quick else 1
+
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    result = {
+        'revision': gitRevision(),
+        'python': platform.python_version(),
+        'platform': os.environ['QT_QPA_PLATFORM'],
+        'paint': benchPaint(app, [160, 320, 640, 1280], int(200 * scale) or 1),
+        'drag': benchDrag(app, 320, int(5000 * scale) or 1),
+        'engine_ticks': benchEngineTicks([1, 10, 100, 1000], int(100 * scale) or 1),
+        'timer_store': benchTimerStore([1000, 10000, 100000], int(100 * scale) or 1),
+        'virtual_clock': benchVirtualClock([1, 10, 100], int(3600 * scale) or 1),
+    }
+    text = json.dumps(result, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+from qtpy.QtWidgets import QWidget
+from qtpy.QtCore import Slot
+from minimaltimer.timerengine import TimerEngine
+from minimaltimer.time import Time
+
+class AbstractTimerView(QWidget):
+    def __init__(self, parent: QWidget = None) -> None:
+        super().__init__(parent)
+        self._engine = None
+
+    def setEngine(self, engine: TimerEngine) -> None:
+        self._engine = engine
+        if self._engine:
+            self._engine.timeValueChanged.connect(self.onEngineTimeChanged)
+            self._engine.timeout.connect(self.onEngineTimeout)
+            self.handleTimeChanged(self._engine.getTime())
+
+    def handleTimeChanged(self, time: Time) -> None:
+        pass
+
+    def handleTimeout(self) -> None:
+        pass
+
+    def getEngine(self) -> TimerEngine:
+        return self._engine
+
+    def isEngineReadOnly(self) -> bool:
+        # Views do not offer editing for engines that cannot be set.
+        engine = self.getEngine()
+        return not engine or engine.isReadOnly()
+
+    def getEngineTime(self) -> Time:
+        engine = self.getEngine()
+        if not engine:
+            return Time()
+        return engine.getTime()
+
+    def setEngineTime(self, time: Time) -> None:
+        engine = self.getEngine()
+        if not engine:
+            print("Error: A timer engine is not exist.")
+            return
+        engine.setTime(time)
+
+    @Slot(object, object)
+    def onEngineTimeChanged(self, time: Time, oldTime: Time) -> None:
+        if not self._engine:
+            return
+        self.handleTimeChanged(time)
+
+    @Slot()
+    def onEngineTimeout(self) -> None:
+        if not self._engine:
+            return
+        self.handleTimeout()
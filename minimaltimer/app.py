@@ -1,13 +1,86 @@
+import argparse
+import os
 import sys
+from qtpy.QtCore import QTimer
 from qtpy.QtWidgets import QApplication
-from qtpy.QtGui import QIcon
 from minimaltimer.mainwindow import MainWindow
-from minimaltimer import resources_rc
+from minimaltimer.timerview import BACKEND_OPENGL, BACKEND_RASTER
 
-if __name__ == '__main__':
-    app = QApplication(sys.argv)
+METRICS_DUMP_INTERVAL = 10000
+
+
+def loadWindowIcon(app: QApplication) -> None:
+    # Importing resources_rc decodes the embedded icon, so it is deferred
+    # until the event loop runs and the main window is on its way to screen.
+    from qtpy.QtGui import QIcon
+    from minimaltimer import resources_rc
     app.setWindowIcon(QIcon(":/resources/icon.png"))
-    
-    win = MainWindow()
+
+
+def parseArgs(argv: list) -> tuple:
+    parser = argparse.ArgumentParser(prog='minimaltimer')
+    parser.add_argument('--backend', choices=[BACKEND_RASTER, BACKEND_OPENGL],
+                        default=os.environ.get('MINIMALTIMER_BACKEND', BACKEND_RASTER),
+                        help='rendering backend of the timer view')
+    parser.add_argument('--metrics', metavar='FILE',
+                        help='record tick and paint metrics and dump them to FILE '
+                             '(JSON for *.json, Prometheus text format otherwise)')
+    parser.add_argument('--instance', metavar='NAME',
+                        help='keep the timer state in its own file for NAME '
+                             'instead of the first one not used by another window')
+    parser.add_argument('--state', metavar='FILE',
+                        help='keep the timer state in FILE')
+    parser.add_argument('--record-input', metavar='FILE',
+                        help='record mouse input of the timer view to FILE for '
+                             'benchmarks/replay.py')
+    parser.add_argument('--daemon', action='store_true',
+                        help='run the headless timer daemon instead of a window')
+    parser.add_argument('--connect', nargs='?', const='', metavar='SOCKET',
+                        help='show a countdown hosted by a timer daemon')
+    parser.add_argument('--timer', default='default',
+                        help='name of the daemon countdown to show')
+    # Everything else is left for QApplication.
+    return parser.parse_known_args(argv[1:])
+
+
+def main(ready=None) -> int:
+    # ready is called with the application and the main window right before
+    # the event loop starts, e.g. by benchmarks/startup.py to catch the first
+    # paint.
+    args, qtArgs = parseArgs(sys.argv)
+    if args.daemon:
+        from minimaltimer import daemon
+        sys.argv = sys.argv[:1] + qtArgs
+        daemon.main()
+        return 0
+
+    app = QApplication(sys.argv[:1] + qtArgs)
+
+    engine = None
+    if args.connect is not None:
+        from minimaltimer.daemon import defaultSocketPath
+        from minimaltimer.remoteengine import RemoteTimerEngine
+        engine = RemoteTimerEngine(args.connect or defaultSocketPath(), args.timer)
+    if args.metrics:
+        from minimaltimer.metrics import enableMetrics
+        metrics = enableMetrics()
+        metricsTimer = QTimer(app)
+        metricsTimer.timeout.connect(lambda: metrics.dump(args.metrics))
+        metricsTimer.start(METRICS_DUMP_INTERVAL)
+        app.aboutToQuit.connect(lambda: metrics.dump(args.metrics))
+
+    win = MainWindow(backend=args.backend, statePath=args.state, engine=engine,
+                     instance=args.instance)
     win.show()
-    app.exec_()
+    if args.record_input:
+        from minimaltimer.inputtrace import InputRecorder
+        recorder = InputRecorder(win.timerView())
+        app.aboutToQuit.connect(lambda: recorder.save(args.record_input))
+    QTimer.singleShot(0, lambda: loadWindowIcon(app))
+    if ready:
+        ready(app, win)
+    return app.exec_()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,94 @@
+import asyncio
+from minimaltimer.clock import Alarm
+from minimaltimer.countdown import Countdown, NS_PER_MSEC
+from minimaltimer.time import Time
+
+
+class AsyncioAlarm(Alarm):
+    def __init__(self, clock, callback, loop: asyncio.AbstractEventLoop) -> None:
+        super().__init__(clock, callback)
+        self._loop = loop
+        self._handle: asyncio.TimerHandle = None
+
+    def startReal(self, delayNs: int) -> None:
+        self._handle = self._loop.call_later(delayNs / (1000 * NS_PER_MSEC), self.fire)
+
+    def stopReal(self) -> None:
+        if self._handle:
+            self._handle.cancel()
+            self._handle = None
+
+
+class AsyncioDriver:
+    def __init__(self, countdown: Countdown = None,
+                 loop: asyncio.AbstractEventLoop = None) -> None:
+        self._countdown = countdown or Countdown()
+        # Without an explicit loop the driver must be created inside a running
+        # one, get_running_loop() raises RuntimeError otherwise.
+        self._loop = loop or asyncio.get_running_loop()
+        # On a VirtualClock the ticks are run by clock.advance() instead.
+        self._alarm = AsyncioAlarm(self._countdown.clock(), self._countdown.tick,
+                                   self._loop)
+        self._timeoutWaiters = []
+        self._tickQueues = []
+
+        self._countdown.scheduleChanged.connect(self.rearm)
+        self._countdown.timeChanged.connect(self.onTimeChanged)
+        self._countdown.timeout.connect(self.onTimeout)
+        self.rearm()
+
+    def countdown(self) -> Countdown:
+        return self._countdown
+
+    def rearm(self) -> None:
+        self._alarm.arm(self._countdown.nextWakeup())
+
+    def close(self) -> None:
+        self._alarm.disarm()
+        self._countdown.scheduleChanged.disconnect(self.rearm)
+        self._countdown.timeChanged.disconnect(self.onTimeChanged)
+        self._countdown.timeout.disconnect(self.onTimeout)
+
+    def isExpired(self) -> bool:
+        # At zero with nothing counting down, no timeout is coming until the
+        # time is set again.
+        return not self._countdown.isRunning() and \
+            self._countdown.getTime().getMilliseconds() == 0
+
+    async def timeout(self) -> None:
+        # Returns right away if the countdown has already run out or was never
+        # set, a paused countdown is waited for.
+        if self.isExpired():
+            return
+        waiter = self._loop.create_future()
+        self._timeoutWaiters.append(waiter)
+        await waiter
+
+    async def ticks(self):
+        # Yields a copy of the time on every change, ends after the timeout or
+        # right away if the countdown has already run out.
+        if self.isExpired():
+            return
+        queue = asyncio.Queue()
+        self._tickQueues.append(queue)
+        try:
+            while True:
+                time = await queue.get()
+                if time is None:
+                    return
+                yield time
+        finally:
+            self._tickQueues.remove(queue)
+
+    def onTimeChanged(self) -> None:
+        msecs = self._countdown.getTime().getMilliseconds()
+        for queue in self._tickQueues:
+            queue.put_nowait(Time(msecs=msecs))
+
+    def onTimeout(self) -> None:
+        waiters, self._timeoutWaiters = self._timeoutWaiters, []
+        for waiter in waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+        for queue in self._tickQueues:
+            queue.put_nowait(None)
@@ -0,0 +1,125 @@
+from heapq import heappop, heappush
+from time import monotonic_ns
+
+
+class MonotonicClock:
+    # The real clock, used unless a countdown is given another one. Clocks
+    # only need now() returning nanoseconds on a clock that never goes back.
+    now = staticmethod(monotonic_ns)
+
+    def isVirtual(self) -> bool:
+        return False
+
+
+class VirtualClock:
+    # A clock that only moves when advance() is called. Engines on a virtual
+    # clock register their wakeups here instead of starting Qt timers, and
+    # advance() runs them in order with now() set to each wakeup time, so
+    # hours of countdown take as long as the ticks themselves.
+    def __init__(self, start: int = 0) -> None:
+        self._now: int = start
+        self._heap = []
+        self._callbacks = {}
+        self._nextHandle: int = 1
+
+    def isVirtual(self) -> bool:
+        return True
+
+    def now(self) -> int:
+        return self._now
+
+    def callAt(self, when: int, callback) -> int:
+        handle = self._nextHandle
+        self._nextHandle += 1
+        self._callbacks[handle] = callback
+        heappush(self._heap, (when, handle))
+        return handle
+
+    def cancel(self, handle: int) -> None:
+        # The heap entry stays and is skipped when it comes up.
+        self._callbacks.pop(handle, None)
+
+    def pendingCount(self) -> int:
+        return len(self._callbacks)
+
+    def nextWakeup(self) -> int:
+        while self._heap and self._heap[0][1] not in self._callbacks:
+            heappop(self._heap)
+        return self._heap[0][0] if self._heap else None
+
+    def advance(self, nsecs: int, latenessNs: int = 0) -> int:
+        # Moves the clock forward by nsecs and runs every callback that comes
+        # due on the way, including ones scheduled by earlier callbacks.
+        # latenessNs delivers each wakeup that much late to simulate a busy
+        # event loop. Returns the number of callbacks run.
+        return self.advanceTo(self._now + nsecs, latenessNs)
+
+    def advanceTo(self, target: int, latenessNs: int = 0) -> int:
+        ran = 0
+        while True:
+            wakeup = self.nextWakeup()
+            if wakeup is None or wakeup + latenessNs > target:
+                break
+            _, handle = heappop(self._heap)
+            callback = self._callbacks.pop(handle)
+            self._now = max(self._now, wakeup + latenessNs)
+            callback()
+            ran += 1
+        self._now = max(self._now, target)
+        return ran
+
+
+class Alarm:
+    # One pending wakeup at a time on a clock. On a VirtualClock it is
+    # registered with callAt(), on a real clock the event loop timer of a
+    # subclass is started through startReal()/stopReal(). Engines and drivers
+    # re-arm it with their next wakeup and get `callback` called once.
+    def __init__(self, clock, callback) -> None:
+        self._clock = clock
+        self._callback = callback
+        self._wakeup: int = None
+        self._virtualHandle: int = None
+
+    def clock(self):
+        return self._clock
+
+    def armedAt(self) -> int:
+        return self._wakeup
+
+    def arm(self, wakeup: int) -> None:
+        # None disarms. Re-arming for the same time keeps the pending timer.
+        if wakeup == self._wakeup:
+            return
+        self.disarm()
+        if wakeup is None:
+            return
+        self._wakeup = wakeup
+        if self._clock.isVirtual():
+            self._virtualHandle = self._clock.callAt(wakeup, self.fire)
+        else:
+            self.startReal(max(0, wakeup - self._clock.now()))
+
+    def disarm(self) -> None:
+        if self._wakeup is None:
+            return
+        if self._virtualHandle is not None:
+            self._clock.cancel(self._virtualHandle)
+            self._virtualHandle = None
+        else:
+            self.stopReal()
+        self._wakeup = None
+
+    def fire(self) -> None:
+        if self._virtualHandle is not None:
+            # Already taken off the clock by advance().
+            self._virtualHandle = None
+        else:
+            self.stopReal()
+        self._wakeup = None
+        self._callback()
+
+    def startReal(self, delayNs: int) -> None:
+        raise NotImplementedError
+
+    def stopReal(self) -> None:
+        raise NotImplementedError
@@ -0,0 +1,42 @@
+from functools import lru_cache
+from math import cos, pi, sin
+
+SECONDS_PER_TURN = 3600
+
+
+class ClockGeometry:
+    def __init__(self, circleRadius: int, textRadius: int) -> None:
+        self.circleRadius = circleRadius
+        self.textRadius = textRadius
+        # Unit vectors for every whole second, clockwise from 12 o'clock in
+        # window coordinates (y grows downwards).
+        self.directions = [(sin(secs * pi / 1800), -cos(secs * pi / 1800))
+                           for secs in range(SECONDS_PER_TURN + 1)]
+        self.smallTicks = [self.tickLine(minute, 10) for minute in range(0, 60)]
+        self.bigTicks = [self.tickLine(minute, 12) for minute in range(0, 60, 5)]
+        self.labelAnchors = []
+        for minute in range(0, 60, 5):
+            x, y = self.directions[minute * 60]
+            self.labelAnchors.append((minute, int(textRadius * x),
+                                      int(textRadius * y)))
+
+    def tickLine(self, minute: int, halfLength: int) -> tuple:
+        x, y = self.directions[minute * 60]
+        inner = self.circleRadius - halfLength
+        outer = self.circleRadius + halfLength
+        return (inner * x, inner * y, outer * x, outer * y)
+
+    def pointAt(self, secs: float) -> tuple:
+        # Point on the circle, interpolated between the whole second entries.
+        secs = min(max(secs, 0), SECONDS_PER_TURN)
+        index = min(int(secs), SECONDS_PER_TURN - 1)
+        t = secs - index
+        x0, y0 = self.directions[index]
+        x1, y1 = self.directions[index + 1]
+        return (self.circleRadius * (x0 + (x1 - x0) * t),
+                self.circleRadius * (y0 + (y1 - y0) * t))
+
+
+@lru_cache(maxsize=None)
+def clockGeometry(circleRadius: int, textRadius: int) -> ClockGeometry:
+    return ClockGeometry(circleRadius, textRadius)
@@ -0,0 +1,215 @@
+from contextlib import contextmanager
+from minimaltimer.clock import MonotonicClock
+from minimaltimer.time import Time
+
+NS_PER_MSEC = 1000000
+
+
+# Tick arithmetic shared by Countdown, TimerScheduler and TimerStore. Both
+# work element-wise on NumPy arrays as well as on ints.
+
+def remainingToTickMsecs(remainingNs, interval: int):
+    # Round up to the tick interval so a 1 s tick shows whole seconds.
+    return -(-remainingNs // (interval * NS_PER_MSEC)) * interval
+
+
+def nsecsToNextTick(remainingNs, interval: int):
+    # Time until the remaining time crosses the next tick boundary, a whole
+    # interval when it is on a boundary now. remainingNs must be positive.
+    intervalNs = interval * NS_PER_MSEC
+    return (remainingNs - 1) % intervalNs + 1
+
+
+class Notifier:
+    def __init__(self) -> None:
+        self._callbacks = []
+
+    def connect(self, callback) -> None:
+        self._callbacks.append(callback)
+
+    def disconnect(self, callback) -> None:
+        self._callbacks.remove(callback)
+
+    def emit(self, *args) -> None:
+        for callback in list(self._callbacks):
+            callback(*args)
+
+
+class Countdown:
+    def __init__(self, interval: int = 1000, clock=None) -> None:
+        self.timeChanged = Notifier()
+        # Called with (new Time, old Time) copies.
+        self.timeValueChanged = Notifier()
+        self.timeout = Notifier()
+        # Emitted whenever nextWakeup() changes so a driver can re-arm.
+        self.scheduleChanged = Notifier()
+        # Emitted when the countdown is set, paused, resumed or runs out, but
+        # not on ordinary ticks.
+        self.stateChanged = Notifier()
+
+        self._clock = clock or MonotonicClock()
+        self._time = Time()
+        self._interval: int = interval
+        self._paused: bool = False
+        # While counting down, the remaining time is derived from a deadline
+        # on the monotonic clock instead of being decremented once per tick,
+        # so timer jitter and event loop stalls do not accumulate as drift.
+        self._deadline: int = None
+        self._remainingNs: int = 0
+        self._wakeup: int = None
+        # Between beginUpdate() and endUpdate() notifications are held back
+        # and merged into a single one.
+        self._updateDepth: int = 0
+        self._batchOldMsecs: int = None
+        self._batchTimedOut: bool = False
+
+    def clock(self):
+        return self._clock
+
+    def pause(self) -> None:
+        if self._paused:
+            return
+        if self._deadline is not None:
+            self._remainingNs = max(0, self._deadline - self._clock.now())
+        self._paused = True
+        self.startCountdown()
+
+    def resume(self) -> None:
+        if not self._paused:
+            return
+        self._paused = False
+        self.startCountdown()
+
+    def isPaused(self) -> bool:
+        return self._paused
+
+    def isRunning(self) -> bool:
+        return self._deadline is not None
+
+    def setTickInterval(self, msecs: int) -> None:
+        if msecs <= 0:
+            # Invalid interval
+            return
+        self._interval = msecs
+        if self.isRunning():
+            self._remainingNs = max(0, self._deadline - self._clock.now())
+            self.startCountdown()
+
+    def tickInterval(self) -> int:
+        return self._interval
+
+    def nextWakeup(self) -> int:
+        # Time in ns on the countdown's clock at which tick() should be called next, or None
+        # while nothing is counting down.
+        return self._wakeup
+
+    def startCountdown(self) -> None:
+        if self._paused or self._remainingNs <= 0:
+            self._deadline = None
+            self._wakeup = None
+        else:
+            now = self._clock.now()
+            self._deadline = now + self._remainingNs
+            self._wakeup = now + self.nsecsToNextTick()
+        self.scheduleChanged.emit()
+        self.stateChanged.emit()
+
+    def remainingNs(self) -> int:
+        if self._deadline is None:
+            return self._remainingNs
+        return max(0, self._deadline - self._clock.now())
+
+    def restoreState(self, remainingNs: int, paused: bool) -> None:
+        oldMsecs = self._time.getMilliseconds()
+        self._paused = paused
+        self._remainingNs = max(0, remainingNs)
+        self._time.setMilliseconds(self.remainingToTickMsecs())
+        self.startCountdown()
+        if self._time.getMilliseconds() != oldMsecs:
+            self.notifyTimeChanged(oldMsecs)
+
+    def nsecsToNextTick(self) -> int:
+        # Wake up when the remaining time crosses the next tick boundary.
+        return nsecsToNextTick(self._remainingNs, self._interval)
+
+    def remainingToTickMsecs(self) -> int:
+        return remainingToTickMsecs(self._remainingNs, self._interval)
+
+    def tick(self) -> None:
+        if self._deadline is None:
+            return
+        now = self._clock.now()
+        self._remainingNs = max(0, self._deadline - now)
+        msecs = self.remainingToTickMsecs()
+        oldMsecs = self._time.getMilliseconds()
+        changed = msecs != oldMsecs
+        if changed:
+            self._time.setMilliseconds(msecs)
+        if msecs == 0:
+            self._deadline = None
+            self._wakeup = None
+        else:
+            self._wakeup = now + self.nsecsToNextTick()
+        self.scheduleChanged.emit()
+        if msecs == 0:
+            self.stateChanged.emit()
+        if changed:
+            self.notifyTimeChanged(oldMsecs)
+        if msecs == 0:
+            self.notifyTimeout()
+
+    def setTime(self, time: Time) -> None:
+        if time.getMilliseconds() < 0:
+            # Invalid time
+            return
+        oldMsecs = self._time.getMilliseconds()
+        # Copied into the engine's own Time, callers keep ownership of theirs.
+        self._time.setMilliseconds(time.getMilliseconds())
+        # Always restarts, the shown time is rounded up and may equal the new
+        # one while the exact remaining time differs.
+        self._remainingNs = time.getMilliseconds() * NS_PER_MSEC
+        self.startCountdown()
+        if oldMsecs != time.getMilliseconds():
+            self.notifyTimeChanged(oldMsecs)
+
+    def getTime(self) -> Time:
+        return self._time
+
+    def beginUpdate(self) -> None:
+        self._updateDepth += 1
+
+    def endUpdate(self) -> None:
+        if self._updateDepth == 0:
+            return
+        self._updateDepth -= 1
+        if self._updateDepth:
+            return
+        oldMsecs, self._batchOldMsecs = self._batchOldMsecs, None
+        timedOut, self._batchTimedOut = self._batchTimedOut, False
+        if oldMsecs is not None and oldMsecs != self._time.getMilliseconds():
+            self.notifyTimeChanged(oldMsecs)
+        if timedOut:
+            self.notifyTimeout()
+
+    @contextmanager
+    def batchUpdate(self):
+        self.beginUpdate()
+        try:
+            yield self
+        finally:
+            self.endUpdate()
+
+    def notifyTimeChanged(self, oldMsecs: int) -> None:
+        if self._updateDepth:
+            if self._batchOldMsecs is None:
+                self._batchOldMsecs = oldMsecs
+            return
+        self.timeChanged.emit()
+        self.timeValueChanged.emit(Time(msecs=self._time.getMilliseconds()),
+                                   Time(msecs=oldMsecs))
+
+    def notifyTimeout(self) -> None:
+        if self._updateDepth:
+            self._batchTimedOut = True
+            return
+        self.timeout.emit()
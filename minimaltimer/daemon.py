@@ -0,0 +1,201 @@
+"""Headless timer daemon.
+
+Hosts any number of named countdowns in one process and serves them over a
+Unix domain socket with a line protocol (UTF-8, one command per line, fields
+separated by spaces):
+
+    client -> daemon                 daemon -> client
+    SET <name> <msecs> [<seq>]       TIME <name> <msecs> <paused>
+    PAUSE <name>                     TIMEOUT <name>
+    RESUME <name>                    OK <name> <seq>
+                                     ERR <message>
+    GET <name>
+    SUB <name>
+    UNSUB <name>
+
+Timers are created by SET and SUB, the other commands need an existing timer.
+Subscribers receive a TIME line right away
+and on every change, and a TIMEOUT line when the countdown runs out. A SET
+with a sequence number is acknowledged with an OK line after the TIME line it
+caused, so a client can tell echoes of older SETs from the current state. A
+subscriber that does not read its lines is disconnected once more than
+MAX_BUFFERED bytes are waiting for it.
+
+    python -m minimaltimer.daemon [--socket PATH]
+"""
+import argparse
+import asyncio
+import getpass
+import os
+import tempfile
+from minimaltimer.asynciodriver import AsyncioDriver
+from minimaltimer.countdown import Countdown
+from minimaltimer.time import Time
+
+
+COMMANDS = ('SET', 'PAUSE', 'RESUME', 'GET', 'SUB', 'UNSUB')
+# Commands that create the timer if it does not exist yet.
+CREATING_COMMANDS = ('SET', 'SUB')
+MAX_BUFFERED = 64 * 1024
+
+
+def defaultSocketPath() -> str:
+    return os.path.join(tempfile.gettempdir(), f"minimaltimer-{getpass.getuser()}.sock")
+
+
+class DaemonTimer:
+    def __init__(self, name: str, loop: asyncio.AbstractEventLoop) -> None:
+        self.name = name
+        self.countdown = Countdown()
+        self.driver = AsyncioDriver(self.countdown, loop)
+        self.subscribers = set()
+        self.lastStateLine: bytes = None
+
+    def stateLine(self) -> bytes:
+        msecs = self.countdown.getTime().getMilliseconds()
+        paused = int(self.countdown.isPaused())
+        return f"TIME {self.name} {msecs} {paused}\n".encode()
+
+
+class TimerDaemon:
+    def __init__(self, path: str = None) -> None:
+        self._path = path or defaultSocketPath()
+        self._timers = {}
+        self._server: asyncio.AbstractServer = None
+        # Only the daemon that bound the socket removes it again.
+        self._ownsPath: bool = False
+
+    def path(self) -> str:
+        return self._path
+
+    def timer(self, name: str) -> DaemonTimer:
+        timer = self._timers.get(name)
+        if timer is None:
+            timer = DaemonTimer(name, asyncio.get_running_loop())
+            timer.countdown.timeChanged.connect(lambda: self.publishState(timer))
+            timer.countdown.stateChanged.connect(lambda: self.publishState(timer))
+            timer.countdown.timeout.connect(
+                lambda: self.publish(timer, f"TIMEOUT {name}\n".encode()))
+            self._timers[name] = timer
+        return timer
+
+    def publishState(self, timer: DaemonTimer) -> None:
+        # Setting a time changes both the state and the value, send it once.
+        line = timer.stateLine()
+        if line != timer.lastStateLine:
+            timer.lastStateLine = line
+            self.publish(timer, line)
+
+    def publish(self, timer: DaemonTimer, line: bytes) -> None:
+        for writer in list(timer.subscribers):
+            if writer.is_closing():
+                timer.subscribers.discard(writer)
+                continue
+            if writer.transport.get_write_buffer_size() > MAX_BUFFERED:
+                # A stalled client, buffering more would grow without bound.
+                timer.subscribers.discard(writer)
+                writer.close()
+                continue
+            writer.write(line)
+
+    async def start(self) -> None:
+        if os.path.exists(self._path):
+            try:
+                _, writer = await asyncio.open_unix_connection(self._path)
+            except OSError:
+                # Left behind by a daemon that did not shut down cleanly.
+                os.unlink(self._path)
+            else:
+                writer.close()
+                raise FileExistsError(f"a timer daemon is already running on {self._path}")
+        self._server = await asyncio.start_unix_server(self.handleClient, self._path)
+        self._ownsPath = True
+
+    async def serveForever(self) -> None:
+        await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    def close(self) -> None:
+        if self._server:
+            self._server.close()
+            self._server = None
+        for timer in self._timers.values():
+            timer.driver.close()
+        if self._ownsPath and os.path.exists(self._path):
+            os.unlink(self._path)
+        self._ownsPath = False
+
+    async def handleClient(self, reader: asyncio.StreamReader,
+                           writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                reply = self.handleCommand(line.decode(errors='replace').split(), writer)
+                if reply:
+                    writer.write(reply)
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            for timer in self._timers.values():
+                timer.subscribers.discard(writer)
+            writer.close()
+
+    def handleCommand(self, fields: list, writer: asyncio.StreamWriter) -> bytes:
+        if len(fields) < 2:
+            return b"ERR expected: <command> <name> [args]\n"
+        command, name, args = fields[0].upper(), fields[1], fields[2:]
+        if command not in COMMANDS:
+            return f"ERR unknown command {command}\n".encode()
+        if command == 'SET':
+            try:
+                msecs = int(args[0])
+            except (IndexError, ValueError):
+                return b"ERR SET expects milliseconds\n"
+            if msecs < 0:
+                return b"ERR SET expects a time of 0 or more milliseconds\n"
+        if command in CREATING_COMMANDS:
+            timer = self.timer(name)
+        else:
+            timer = self._timers.get(name)
+            if timer is None:
+                return f"ERR unknown timer {name}\n".encode()
+        if command == 'SET':
+            timer.countdown.setTime(Time(msecs=msecs))
+            if len(args) > 1:
+                return f"OK {name} {args[1]}\n".encode()
+        elif command == 'PAUSE':
+            timer.countdown.pause()
+        elif command == 'RESUME':
+            timer.countdown.resume()
+        elif command == 'GET':
+            return timer.stateLine()
+        elif command == 'SUB':
+            timer.subscribers.add(writer)
+            return timer.stateLine()
+        elif command == 'UNSUB':
+            timer.subscribers.discard(writer)
+        return None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Minimal Timer daemon")
+    parser.add_argument('--socket', default=defaultSocketPath(),
+                        help='path of the Unix domain socket')
+    args = parser.parse_args()
+    daemon = TimerDaemon(args.socket)
+    try:
+        asyncio.run(daemon.serveForever())
+    except KeyboardInterrupt:
+        pass
+    except FileExistsError as e:
+        print(f"Error: {e}")
+    finally:
+        daemon.close()
+
+
+if __name__ == '__main__':
+    main()
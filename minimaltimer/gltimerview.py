@@ -0,0 +1,48 @@
+from qtpy.QtWidgets import QOpenGLWidget, QVBoxLayout, QWidget
+from qtpy.QtCore import QRect, Qt
+from qtpy.QtGui import QPainter, QSurfaceFormat
+from minimaltimer.timerview import TimerView
+
+
+class GLSurface(QOpenGLWidget):
+    def __init__(self, view: TimerView) -> None:
+        super().__init__(view)
+        self._view = view
+        surfaceFormat = QSurfaceFormat()
+        # Multisampling replaces the raster engine's software antialiasing.
+        surfaceFormat.setSamples(4)
+        self.setFormat(surfaceFormat)
+        # Input is handled by the TimerView underneath the surface.
+        self.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents)
+
+    def paintGL(self) -> None:
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), self._view.palette().window())
+        self._view.paintClock(painter)
+        painter.end()
+
+
+class GLTimerView(TimerView):
+    # Same geometry, caches and input handling as TimerView, but the clock is
+    # painted by the OpenGL paint engine on a QOpenGLWidget that covers the
+    # view.
+    def __init__(self, parent: QWidget = None) -> None:
+        super().__init__(parent)
+        self._surface = GLSurface(self)
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(self._surface)
+
+    def surface(self) -> GLSurface:
+        return self._surface
+
+    def paintEvent(self, event) -> None:
+        # Everything is drawn by the surface.
+        pass
+
+    def schedulePaint(self, rect: QRect) -> None:
+        # An OpenGL surface always redraws its whole framebuffer.
+        self._surface.update()
+
+    def repaintNow(self) -> None:
+        self._surface.repaint()
@@ -0,0 +1,108 @@
+import struct
+from time import monotonic_ns
+from qtpy.QtCore import QEvent, QObject, QPoint, Qt
+from qtpy.QtGui import QMouseEvent
+from qtpy.QtWidgets import QWidget
+
+# Event kinds as stored in a trace file.
+PRESS = 1
+MOVE = 2
+RELEASE = 3
+
+EVENT_TYPES = {
+    QEvent.Type.MouseButtonPress: PRESS,
+    QEvent.Type.MouseMove: MOVE,
+    QEvent.Type.MouseButtonRelease: RELEASE,
+}
+
+
+class InputTrace:
+    # Mouse events of one widget with their timing. The file is a header with
+    # the widget size followed by 17 byte records of (microseconds since the
+    # previous event, kind, button, buttons, x, y) in widget coordinates.
+    MAGIC = b'MTIT'
+    VERSION = 2
+    HEADER = struct.Struct('<4sHHH')
+    # Buttons are Qt.MouseButton bit masks, which go up to 0x4000000.
+    RECORD = struct.Struct('<IBIIhh')
+
+    def __init__(self, width: int = 0, height: int = 0) -> None:
+        self.width = width
+        self.height = height
+        # (ns since the first event, kind, button, buttons, x, y)
+        self.events = []
+
+    def append(self, timestamp: int, kind: int, button: int, buttons: int,
+               x: int, y: int) -> None:
+        self.events.append((timestamp, kind, button, buttons, x, y))
+
+    def duration(self) -> int:
+        return self.events[-1][0] if self.events else 0
+
+    def save(self, path: str) -> None:
+        with open(path, 'wb') as f:
+            f.write(self.HEADER.pack(self.MAGIC, self.VERSION, self.width, self.height))
+            previous = 0
+            for timestamp, kind, button, buttons, x, y in self.events:
+                delta = min(0xFFFFFFFF, (timestamp - previous) // 1000)
+                previous += delta * 1000
+                f.write(self.RECORD.pack(delta, kind, button, buttons,
+                                         max(-32768, min(32767, x)),
+                                         max(-32768, min(32767, y))))
+
+    @classmethod
+    def load(cls, path: str) -> 'InputTrace':
+        with open(path, 'rb') as f:
+            data = f.read()
+        magic, version, width, height = cls.HEADER.unpack_from(data, 0)
+        if magic != cls.MAGIC or version != cls.VERSION:
+            raise ValueError(f"{path!r} is not an input trace")
+        trace = cls(width, height)
+        timestamp = 0
+        for delta, kind, button, buttons, x, y in cls.RECORD.iter_unpack(
+                data[cls.HEADER.size:]):
+            timestamp += delta * 1000
+            trace.append(timestamp, kind, button, buttons, x, y)
+        return trace
+
+    @staticmethod
+    def toMouseEvent(event: tuple) -> QMouseEvent:
+        _, kind, button, buttons, x, y = event
+        eventType = {PRESS: QEvent.Type.MouseButtonPress,
+                     MOVE: QEvent.Type.MouseMove,
+                     RELEASE: QEvent.Type.MouseButtonRelease}[kind]
+        return QMouseEvent(eventType, QPoint(x, y), Qt.MouseButton(button),
+                           Qt.MouseButton(buttons), Qt.KeyboardModifier.NoModifier)
+
+
+class InputRecorder(QObject):
+    # Records the mouse events a widget receives into an InputTrace.
+    def __init__(self, widget: QWidget) -> None:
+        super().__init__(widget)
+        self._widget = widget
+        self._trace = InputTrace(widget.width(), widget.height())
+        self._start: int = None
+        widget.installEventFilter(self)
+
+    def trace(self) -> InputTrace:
+        return self._trace
+
+    def eventFilter(self, obj: QObject, event: QEvent) -> bool:
+        kind = EVENT_TYPES.get(event.type())
+        if kind is not None and obj is self._widget:
+            now = monotonic_ns()
+            if self._start is None:
+                self._start = now
+                # The size at the first event decides the clock geometry.
+                self._trace.width = self._widget.width()
+                self._trace.height = self._widget.height()
+            pos = event.pos()
+            self._trace.append(now - self._start, kind, int(event.button()),
+                               int(event.buttons()), pos.x(), pos.y())
+        return False
+
+    def save(self, path: str) -> None:
+        self._trace.save(path)
+
+    def stop(self) -> None:
+        self._widget.removeEventFilter(self)
@@ -0,0 +1,54 @@
+from collections import OrderedDict
+from qtpy.QtCore import QPointF, Qt
+from qtpy.QtGui import QFont, QFontMetrics, QStaticText, QTransform
+from minimaltimer.clockgeometry import ClockGeometry
+
+
+class LabelCache:
+    MAX_ENTRIES = 8
+
+    def __init__(self) -> None:
+        # (font, scale, device pixel ratio, text radius) -> laid out labels.
+        # Entries for an old font or DPI simply age out of the LRU order.
+        self._entries = OrderedDict()
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def labels(self, font: QFont, geometry: ClockGeometry,
+               transform: QTransform, dpr: float) -> list:
+        key = (font.key(), transform.m11(), transform.m22(), dpr,
+               geometry.textRadius)
+        labels = self._entries.get(key)
+        if labels is not None:
+            self._entries.move_to_end(key)
+            return labels
+
+        fontMetrics = QFontMetrics(font)
+        labels = []
+        for minute, x, y in geometry.labelAnchors:
+            text = QStaticText(str(minute))
+            text.setTextFormat(Qt.TextFormat.PlainText)
+            text.setPerformanceHint(QStaticText.PerformanceHint.AggressiveCaching)
+            text.prepare(transform, font)
+            textWidth = fontMetrics.width(str(minute))
+            textHeight = fontMetrics.height()
+            # QStaticText is positioned by its top left corner, not the baseline.
+            pos = QPointF(x - textWidth // 2,
+                          y + textHeight // 2 - fontMetrics.ascent())
+            labels.append((text, pos))
+
+        self._entries[key] = labels
+        if len(self._entries) > self.MAX_ENTRIES:
+            self._entries.popitem(last=False)
+        return labels
+
+
+_sharedLabelCache: LabelCache = None
+
+
+def sharedLabelCache() -> LabelCache:
+    global _sharedLabelCache
+    if _sharedLabelCache is None:
+        _sharedLabelCache = LabelCache()
+    return _sharedLabelCache
@@ -1,21 +1,45 @@
-from qtpy.QtWidgets import QMainWindow, QWidget, QVBoxLayout, QSizePolicy
-from qtpy.QtCore import Qt
-from qtpy.QtGui import QIcon
+import os
+from qtpy.QtWidgets import QApplication, QMainWindow, QWidget, QVBoxLayout, QSizePolicy
+from qtpy.QtCore import QObject, Qt, QStandardPaths, QTimer
+from qtpy.QtGui import QCloseEvent
+from minimaltimer.notifications import sharedTimeoutNotifier
+from minimaltimer.persistence import TimerStateStore
 from minimaltimer.timerengine import TimerEngine
-from minimaltimer.timerview import SpinboxTimerView, TimerView
-from minimaltimer.optionsbar import OptionsBar
+from minimaltimer.timerview import BACKEND_RASTER, TimerView, createTimerView
+
 
 class MainWindow(QMainWindow):
-    def __init__(self, parent: QWidget = None) -> None:
+    # Without a statePath or instance name, the first window uses timer.state
+    # and concurrent ones take the next free timer-<n>.state.
+    MAX_INSTANCES = 64
+
+    def __init__(self, parent: QWidget = None,
+                 backend: str = BACKEND_RASTER, statePath: str = None,
+                 engine: QObject = None, instance: str = None) -> None:
         super().__init__(parent)
         self.setWindowTitle("Minimal Timer v1.0")
         self.setWindowFlag(Qt.WindowType.WindowStaysOnTopHint)
 
-        self._timerview = TimerView(self)
-        self._timerengine = TimerEngine(self)
+        self._timerview = createTimerView(backend, self)
+        # A given engine, e.g. a RemoteTimerEngine, keeps its state elsewhere.
+        self._timerengine = engine or TimerEngine(self)
         self._timerview.setEngine(self._timerengine)
 
+        self._stateStore: TimerStateStore = None
+        self._statePaths = []
+        if engine is None:
+            if statePath is not None:
+                self._statePaths = [statePath]
+            else:
+                self._statePaths = self.defaultStatePaths(instance)
+            # Restored once the event loop runs, so a timeout that happened
+            # while the application was down is reported to a visible window.
+            QTimer.singleShot(0, self.restoreTimerState)
+
+        sharedTimeoutNotifier().timedOut.connect(self.onTimedOut)
+
         #TODO: Add options later
+        #from minimaltimer.optionsbar import OptionsBar
         #self._optionsbar = OptionsBar(self)
 
         self._centralwidget = QWidget()
@@ -23,6 +47,50 @@ class MainWindow(QMainWindow):
         self.setupCentralWidget()
         self.resize(320, 320)
 
+    def timerView(self) -> TimerView:
+        return self._timerview
+
+    def defaultStatePaths(self, instance: str = None) -> list:
+        directory = QStandardPaths.writableLocation(
+            QStandardPaths.StandardLocation.AppDataLocation)
+        if instance:
+            return [os.path.join(directory, f'timer-{instance}.state')]
+        return [os.path.join(directory, 'timer.state')] + \
+            [os.path.join(directory, f'timer-{n}.state')
+             for n in range(2, self.MAX_INSTANCES + 1)]
+
+    def restoreTimerState(self) -> None:
+        for path in self._statePaths:
+            store = TimerStateStore(path)
+            try:
+                store.open()
+            except BlockingIOError:
+                continue
+            except OSError as e:
+                print(f"Error: Cannot open the timer state {path}: {e}")
+                return
+            self._stateStore = store
+            break
+        else:
+            print("Error: Every timer state file is in use, the timer is not saved.")
+            return
+        countdown = self._timerengine.countdown()
+        try:
+            self._stateStore.attach(countdown)
+            self._stateStore.restore(countdown)
+        except OSError as e:
+            print(f"Error: Cannot restore the timer state from {self._stateStore.path()}: {e}")
+
+    def onTimedOut(self, sources: list) -> None:
+        if self._timerview in sources:
+            # Flashes the taskbar entry without taking focus or blocking.
+            QApplication.alert(self)
+
+    def closeEvent(self, event: QCloseEvent) -> None:
+        if self._stateStore:
+            self._stateStore.close()
+        return super().closeEvent(event)
+
     def setupCentralWidget(self) -> None:
         self._centralwidget.setLayout(QVBoxLayout())
         self._centralwidget.layout().addWidget(self._timerview)
@@ -0,0 +1,139 @@
+import json
+import os
+from array import array
+from bisect import bisect_left
+
+
+class RingHistogram:
+    # Keeps the last `capacity` samples in a ring buffer for percentiles and
+    # cumulative bucket counts for Prometheus. Recording never allocates.
+    BUCKETS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 1000)
+
+    def __init__(self, capacity: int = 1024, buckets: tuple = BUCKETS) -> None:
+        self._ring = array('d', bytes(8 * capacity))
+        self._capacity = capacity
+        self._index: int = 0
+        self._count: int = 0
+        self._sum: float = 0.0
+        self._max: float = 0.0
+        self._buckets = buckets
+        self._bucketCounts = array('Q', bytes(8 * (len(buckets) + 1)))
+
+    def record(self, value: float) -> None:
+        self._ring[self._index] = value
+        self._index = (self._index + 1) % self._capacity
+        self._count += 1
+        self._sum += value
+        if value > self._max:
+            self._max = value
+        self._bucketCounts[bisect_left(self._buckets, value)] += 1
+
+    def count(self) -> int:
+        return self._count
+
+    def recent(self) -> list:
+        return sorted(self._ring[:min(self._count, self._capacity)])
+
+    def snapshot(self) -> dict:
+        recent = self.recent()
+
+        def percentile(p: float) -> float:
+            if not recent:
+                return 0.0
+            return recent[min(len(recent) - 1, int(len(recent) * p))]
+
+        return {'count': self._count,
+                'sum': self._sum,
+                'max': self._max,
+                'p50': percentile(0.50),
+                'p90': percentile(0.90),
+                'p99': percentile(0.99)}
+
+    def prometheusLines(self, name: str) -> list:
+        lines = [f"# TYPE {name} histogram"]
+        cumulative = 0
+        for bound, count in zip(self._buckets, self._bucketCounts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{le="{bound}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{le="+Inf"}} {self._count}')
+        lines.append(f"{name}_sum {self._sum}")
+        lines.append(f"{name}_count {self._count}")
+        return lines
+
+
+class Metrics:
+    COUNTERS = ('ticks', 'paints', 'coalesced_updates', 'dropped_drag_events')
+
+    def __init__(self, capacity: int = 1024) -> None:
+        # All durations are in milliseconds.
+        self.tickLateness = RingHistogram(capacity)
+        self.paintDuration = RingHistogram(capacity)
+        self.paintInterval = RingHistogram(capacity)
+        self.counters = dict.fromkeys(self.COUNTERS, 0)
+        self._lastPaintNs: int = None
+
+    def count(self, name: str, n: int = 1) -> None:
+        self.counters[name] += n
+
+    def recordTick(self, latenessNs: int) -> None:
+        self.counters['ticks'] += 1
+        self.tickLateness.record(latenessNs / 1e6)
+
+    def recordPaint(self, startNs: int, endNs: int) -> None:
+        self.counters['paints'] += 1
+        self.paintDuration.record((endNs - startNs) / 1e6)
+        if self._lastPaintNs is not None:
+            self.paintInterval.record((startNs - self._lastPaintNs) / 1e6)
+        self._lastPaintNs = startNs
+
+    def histograms(self) -> dict:
+        return {'tick_lateness_ms': self.tickLateness,
+                'paint_duration_ms': self.paintDuration,
+                'paint_interval_ms': self.paintInterval}
+
+    def toDict(self) -> dict:
+        result = {name: hist.snapshot() for name, hist in self.histograms().items()}
+        result['counters'] = dict(self.counters)
+        return result
+
+    def toPrometheus(self) -> str:
+        lines = []
+        for name, hist in self.histograms().items():
+            lines += hist.prometheusLines(f"minimaltimer_{name}")
+        for name, value in self.counters.items():
+            lines.append(f"# TYPE minimaltimer_{name}_total counter")
+            lines.append(f"minimaltimer_{name}_total {value}")
+        return '\n'.join(lines) + '\n'
+
+    def dump(self, path: str) -> None:
+        # JSON for *.json, Prometheus text format otherwise. The file is
+        # replaced atomically so a scraper never sees a partial dump.
+        if path.endswith('.json'):
+            text = json.dumps(self.toDict(), indent=2) + '\n'
+        else:
+            text = self.toPrometheus()
+        tmpPath = path + '.tmp'
+        with open(tmpPath, 'w') as f:
+            f.write(text)
+        os.replace(tmpPath, path)
+
+
+_activeMetrics: Metrics = None
+
+
+def enableMetrics(capacity: int = 1024) -> Metrics:
+    global _activeMetrics
+    if _activeMetrics is None:
+        _activeMetrics = Metrics(capacity)
+    return _activeMetrics
+
+
+def disableMetrics() -> None:
+    global _activeMetrics
+    _activeMetrics = None
+
+
+def activeMetrics() -> Metrics:
+    # None unless enableMetrics() was called, instrumented code checks this
+    # first so disabled metrics cost a single function call.
+    return _activeMetrics
@@ -0,0 +1,36 @@
+from qtpy.QtCore import QObject, QTimer, Signal
+
+
+class TimeoutNotifier(QObject):
+    # Collects timeouts without blocking the event loop. Everything reported
+    # during one event loop iteration is delivered as a single timedOut
+    # emission with the list of sources.
+    timedOut = Signal(list)
+
+    def __init__(self, parent: QObject = None) -> None:
+        super().__init__(parent)
+        self._pending = []
+        self._scheduled = False
+
+    def notify(self, source: object) -> None:
+        if source not in self._pending:
+            self._pending.append(source)
+        if not self._scheduled:
+            self._scheduled = True
+            QTimer.singleShot(0, self.flush)
+
+    def flush(self) -> None:
+        pending, self._pending = self._pending, []
+        self._scheduled = False
+        if pending:
+            self.timedOut.emit(pending)
+
+
+_sharedTimeoutNotifier: TimeoutNotifier = None
+
+
+def sharedTimeoutNotifier() -> TimeoutNotifier:
+    global _sharedTimeoutNotifier
+    if _sharedTimeoutNotifier is None:
+        _sharedTimeoutNotifier = TimeoutNotifier()
+    return _sharedTimeoutNotifier
@@ -0,0 +1,152 @@
+import os
+import struct
+import zlib
+from time import time_ns
+from minimaltimer.countdown import Countdown
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
+
+
+class TimerStateStore:
+    # The file holds two fixed-size records that are written alternately.
+    # Each carries a sequence number and a CRC, so a torn write can only
+    # damage the older copy and load() falls back to the newer valid one.
+    #
+    # A file belongs to one process at a time: open() takes an exclusive lock
+    # and raises BlockingIOError if another instance holds it, because two
+    # writers with their own sequence numbers would overwrite each other.
+    MAGIC = b'MTST'
+    VERSION = 1
+    RECORD = struct.Struct('<4sBBxxQqq')
+    CHECKSUM = struct.Struct('<I')
+    SLOT_SIZE = RECORD.size + CHECKSUM.size
+
+    FLAG_PAUSED = 1
+    FLAG_RUNNING = 2
+
+    def __init__(self, path: str, fsync: bool = False) -> None:
+        self._path = path
+        # Without fsync a process crash is safe, a power loss may lose the
+        # latest state change.
+        self._fsync = fsync
+        self._file = None
+        self._seq: int = 0
+        self._lastState: tuple = None
+        # Set by close(), a closed store does not reopen itself on write().
+        self._closed: bool = False
+        self._attached: tuple = None
+
+    def path(self) -> str:
+        return self._path
+
+    def open(self) -> None:
+        if self._file:
+            return
+        self._closed = False
+        directory = os.path.dirname(self._path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        mode = 'r+b' if os.path.exists(self._path) else 'w+b'
+        self._file = open(self._path, mode, buffering=0)
+        try:
+            self.lock()
+        except OSError:
+            self._file.close()
+            self._file = None
+            raise BlockingIOError(f"{self._path} is in use by another instance")
+
+    def lock(self) -> None:
+        # Released when the file is closed, also if the process dies.
+        if fcntl:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            msvcrt.locking(self._file.fileno(), msvcrt.LK_NBLCK, 1)
+
+    def close(self) -> None:
+        self.detach()
+        self._closed = True
+        if self._file:
+            self._file.close()
+            self._file = None
+
+    def readSlot(self, index: int) -> tuple:
+        self._file.seek(index * self.SLOT_SIZE)
+        data = self._file.read(self.SLOT_SIZE)
+        if len(data) != self.SLOT_SIZE:
+            return None
+        record, checksum = data[:self.RECORD.size], data[self.RECORD.size:]
+        if self.CHECKSUM.unpack(checksum)[0] != zlib.crc32(record):
+            return None
+        magic, version, flags, seq, remainingNs, wallDeadline = \
+            self.RECORD.unpack(record)
+        if magic != self.MAGIC or version != self.VERSION:
+            return None
+        return (seq, flags, remainingNs, wallDeadline)
+
+    def load(self) -> tuple:
+        # Returns (flags, remaining ns, wall clock deadline ns) or None.
+        self.open()
+        slots = [slot for slot in (self.readSlot(0), self.readSlot(1)) if slot]
+        if not slots:
+            return None
+        seq, flags, remainingNs, wallDeadline = max(slots)
+        self._seq = seq
+        self._lastState = (flags, remainingNs, wallDeadline)
+        return self._lastState
+
+    def write(self, flags: int, remainingNs: int, wallDeadline: int) -> None:
+        state = (flags, remainingNs, wallDeadline)
+        if state == self._lastState or self._closed:
+            return
+        self.open()
+        self._seq += 1
+        record = self.RECORD.pack(self.MAGIC, self.VERSION, flags, self._seq,
+                                  remainingNs, wallDeadline)
+        self._file.seek((self._seq % 2) * self.SLOT_SIZE)
+        self._file.write(record + self.CHECKSUM.pack(zlib.crc32(record)))
+        if self._fsync:
+            os.fsync(self._file.fileno())
+        self._lastState = state
+
+    def save(self, countdown: Countdown) -> None:
+        remainingNs = countdown.remainingNs()
+        flags = 0
+        wallDeadline = 0
+        if countdown.isPaused():
+            flags |= self.FLAG_PAUSED
+        if countdown.isRunning():
+            # The monotonic clock does not survive a restart, the wall clock does.
+            flags |= self.FLAG_RUNNING
+            wallDeadline = time_ns() + remainingNs
+        self.write(flags, remainingNs, wallDeadline)
+
+    def restore(self, countdown: Countdown) -> bool:
+        state = self.load()
+        if state is None:
+            return False
+        flags, remainingNs, wallDeadline = state
+        expired = False
+        if flags & self.FLAG_RUNNING:
+            remainingNs = max(0, wallDeadline - time_ns())
+            expired = remainingNs == 0
+        countdown.restoreState(remainingNs, bool(flags & self.FLAG_PAUSED))
+        if expired:
+            # Ran out while the process was down.
+            countdown.notifyTimeout()
+        return True
+
+    def attach(self, countdown: Countdown) -> None:
+        self.detach()
+        callback = lambda: self.save(countdown)
+        countdown.stateChanged.connect(callback)
+        self._attached = (countdown, callback)
+
+    def detach(self) -> None:
+        if self._attached:
+            countdown, callback = self._attached
+            countdown.stateChanged.disconnect(callback)
+            self._attached = None
@@ -0,0 +1,20 @@
+from qtpy.QtCore import QObject, QTimer, Qt
+from minimaltimer.clock import Alarm
+from minimaltimer.countdown import NS_PER_MSEC
+
+
+class QtAlarm(Alarm):
+    # Alarm on a precise single-shot QTimer, shared by the Qt engines.
+    def __init__(self, clock, callback, parent: QObject = None) -> None:
+        super().__init__(clock, callback)
+        self._timer = QTimer(parent)
+        self._timer.setSingleShot(True)
+        self._timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self._timer.timeout.connect(self.fire)
+
+    def startReal(self, delayNs: int) -> None:
+        # Rounded up, a wakeup before the tick boundary would be wasted.
+        self._timer.start(-(-delayNs // NS_PER_MSEC))
+
+    def stopReal(self) -> None:
+        self._timer.stop()
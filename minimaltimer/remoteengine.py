@@ -0,0 +1,143 @@
+from qtpy.QtCore import QObject, QTimer, Signal
+from qtpy.QtNetwork import QLocalSocket
+from minimaltimer.time import Time
+
+
+class RemoteTimerEngine(QObject):
+    # Same interface as TimerEngine, but the countdown runs in a timer daemon
+    # (see minimaltimer.daemon) and this engine only mirrors the state the
+    # daemon pushes. It owns no timer of its own.
+    timeChanged = Signal()
+    # (new Time, old Time)
+    timeValueChanged = Signal(object, object)
+    timeout = Signal()
+    # True once SUB is sent, False when the connection fails or drops.
+    connectionChanged = Signal(bool)
+
+    RECONNECT_MIN_INTERVAL = 250
+    RECONNECT_MAX_INTERVAL = 10000
+
+    def __init__(self, socketPath: str, name: str = 'default',
+                 parent: QObject = None) -> None:
+        super().__init__(parent)
+        self._name = name
+        self._time = Time()
+        self._paused: bool = False
+        # SETs are numbered and acknowledged by the daemon. Until the latest
+        # one is acknowledged, TIME lines are echoes of older values and would
+        # make the hand jump back during a drag.
+        self._sentSeq: int = 0
+        self._ackedSeq: int = 0
+        self._socketPath = socketPath
+        # Retried with exponential backoff while the daemon is not running
+        # or after it restarted.
+        self._reconnectInterval: int = self.RECONNECT_MIN_INTERVAL
+        self._reconnectTimer = QTimer(self)
+        self._reconnectTimer.setSingleShot(True)
+        self._reconnectTimer.timeout.connect(self.connectToDaemon)
+        self._reportedError: str = None
+        self._socket = QLocalSocket(self)
+        self._socket.readyRead.connect(self.onReadyRead)
+        self._socket.connected.connect(self.onConnected)
+        self._socket.disconnected.connect(self.onConnectionLost)
+        self._socket.errorOccurred.connect(self.onConnectionLost)
+        self.connectToDaemon()
+
+    def name(self) -> str:
+        return self._name
+
+    def isConnected(self) -> bool:
+        return self._socket.state() == QLocalSocket.LocalSocketState.ConnectedState
+
+    def connectToDaemon(self) -> None:
+        if self._socket.state() != QLocalSocket.LocalSocketState.UnconnectedState:
+            # Not a lost connection, a reconnect is already under way.
+            wasBlocked = self._socket.blockSignals(True)
+            self._socket.abort()
+            self._socket.blockSignals(wasBlocked)
+        self._socket.connectToServer(self._socketPath)
+
+    def send(self, *fields) -> None:
+        # While disconnected commands are dropped, the failure has already
+        # been reported and the daemon state is fetched again on reconnect.
+        if not self.isConnected():
+            return
+        self._socket.write((' '.join(str(f) for f in fields) + '\n').encode())
+
+    def onConnected(self) -> None:
+        if self._reportedError:
+            print("Timer daemon connection restored.")
+        self._reportedError = None
+        self._reconnectInterval = self.RECONNECT_MIN_INTERVAL
+        # Acknowledgements of SETs sent on the old connection never arrive.
+        self._ackedSeq = self._sentSeq
+        self.send('SUB', self._name)
+        self.connectionChanged.emit(True)
+
+    def onConnectionLost(self, *args) -> None:
+        if self._reconnectTimer.isActive():
+            # disconnected and errorOccurred both report the same failure.
+            return
+        error = self._socket.errorString()
+        if error != self._reportedError:
+            print(f"Error: Lost the timer daemon at {self._socketPath} ({error}), "
+                  f"retrying in {self._reconnectInterval} ms.")
+            self._reportedError = error
+        self._reconnectTimer.start(self._reconnectInterval)
+        self._reconnectInterval = min(self._reconnectInterval * 2,
+                                      self.RECONNECT_MAX_INTERVAL)
+        self.connectionChanged.emit(False)
+
+    def onReadyRead(self) -> None:
+        while self._socket.canReadLine():
+            fields = bytes(self._socket.readLine()).decode(errors='replace').split()
+            if fields and fields[0] == 'ERR':
+                print("Error: Timer daemon:", ' '.join(fields[1:]))
+            if len(fields) < 2 or fields[1] != self._name:
+                continue
+            if fields[0] == 'OK' and len(fields) == 3:
+                self._ackedSeq = int(fields[2])
+            elif fields[0] == 'TIME' and len(fields) == 4:
+                if self._ackedSeq < self._sentSeq:
+                    continue
+                self._paused = fields[3] == '1'
+                self.updateTime(int(fields[2]))
+            elif fields[0] == 'TIMEOUT':
+                self.timeout.emit()
+
+    def updateTime(self, msecs: int) -> None:
+        oldMsecs = self._time.getMilliseconds()
+        if msecs == oldMsecs:
+            return
+        self._time.setMilliseconds(msecs)
+        self.timeChanged.emit()
+        self.timeValueChanged.emit(Time(msecs=msecs), Time(msecs=oldMsecs))
+
+    def pause(self) -> None:
+        self._paused = True
+        self.send('PAUSE', self._name)
+
+    def resume(self) -> None:
+        self._paused = False
+        self.send('RESUME', self._name)
+
+    def isReadOnly(self) -> bool:
+        return False
+
+    def isPaused(self) -> bool:
+        return self._paused
+
+    def setTime(self, time: Time) -> None:
+        if time.getMilliseconds() < 0:
+            # Invalid time
+            return
+        # Sent even if the shown time is the same, the daemon restarts the
+        # countdown from exactly this value. Shown right away, the daemon's echoes are skipped until it
+        # acknowledges this SET.
+        self.updateTime(time.getMilliseconds())
+        if self.isConnected():
+            self._sentSeq += 1
+        self.send('SET', self._name, time.getMilliseconds(), self._sentSeq)
+
+    def getTime(self) -> Time:
+        return self._time
@@ -0,0 +1,67 @@
+from collections import OrderedDict
+from qtpy.QtGui import QPixmap
+
+
+class RenderCache:
+    def __init__(self, maxBytes: int = 32 * 1024 * 1024) -> None:
+        self._entries = OrderedDict()
+        self._bytes: int = 0
+        self._maxBytes: int = maxBytes
+        self._hits: int = 0
+        self._misses: int = 0
+        self._evictions: int = 0
+
+    def get(self, key: tuple, render) -> QPixmap:
+        # Returns the cached pixmap for key, calling render() on a miss.
+        pixmap = self._entries.get(key)
+        if pixmap is not None:
+            self._hits += 1
+            self._entries.move_to_end(key)
+            return pixmap
+
+        self._misses += 1
+        pixmap = render()
+        size = self.pixmapBytes(pixmap)
+        if size <= self._maxBytes:
+            self._entries[key] = pixmap
+            self._bytes += size
+            self.evict()
+        return pixmap
+
+    def evict(self) -> None:
+        while self._bytes > self._maxBytes and self._entries:
+            _, pixmap = self._entries.popitem(last=False)
+            self._bytes -= self.pixmapBytes(pixmap)
+            self._evictions += 1
+
+    def pixmapBytes(self, pixmap: QPixmap) -> int:
+        return pixmap.width() * pixmap.height() * max(pixmap.depth(), 8) // 8
+
+    def setMaxBytes(self, maxBytes: int) -> None:
+        self._maxBytes = maxBytes
+        self.evict()
+
+    def maxBytes(self) -> int:
+        return self._maxBytes
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
+
+    def stats(self) -> dict:
+        return {'hits': self._hits,
+                'misses': self._misses,
+                'evictions': self._evictions,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self._maxBytes}
+
+
+_sharedRenderCache: RenderCache = None
+
+
+def sharedRenderCache() -> RenderCache:
+    global _sharedRenderCache
+    if _sharedRenderCache is None:
+        _sharedRenderCache = RenderCache()
+    return _sharedRenderCache
@@ -0,0 +1,99 @@
+from time import monotonic_ns
+from qtpy.QtCore import QObject, QTimerEvent, Qt
+from qtpy.QtCore import Signal
+from minimaltimer.countdown import remainingToTickMsecs
+from minimaltimer.sharedtable import SharedTimerTable
+from minimaltimer.time import Time
+
+
+class SharedTimerEngine(QObject):
+    # Read-only engine for TimerView that follows one slot of a
+    # SharedTimerTable written by another process.
+    timeChanged = Signal()
+    # (new Time, old Time)
+    timeValueChanged = Signal(object, object)
+    timeout = Signal()
+
+    def __init__(self, table: SharedTimerTable, index: int,
+                 pollInterval: int = 100, idlePollInterval: int = 2000,
+                 parent: QObject = None) -> None:
+        super().__init__(parent)
+        self._table = table
+        self._index = index
+        self._time = Time()
+        self._paused: bool = False
+        self._seq: int = None
+        # Taken from the first read, so a timeout that happened before this
+        # reader attached is not reported.
+        self._timeouts: int = None
+        self._flags: int = 0
+        self._remainingNs: int = 0
+        self._deadline: int = 0
+        # A paused or idle slot only changes when the writer sets it, which
+        # is picked up on the slower idle poll.
+        self._pollInterval: int = pollInterval
+        self._idlePollInterval: int = idlePollInterval
+        self._timerId: int = 0
+        self._timerInterval: int = None
+        self.poll()
+
+    def timerEvent(self, event: QTimerEvent) -> None:
+        self.poll()
+
+    def poll(self) -> None:
+        seq = self._table.seq(self._index)
+        timedOut = False
+        if seq != self._seq:
+            try:
+                self._seq, self._flags, timeouts, self._remainingNs, self._deadline = \
+                    self._table.read(self._index)
+            except BlockingIOError:
+                # Try again on the next poll.
+                self.arm(self._pollInterval)
+                return
+            timedOut = self._timeouts is not None and timeouts != self._timeouts
+            self._timeouts = timeouts
+        running = bool(self._flags & SharedTimerTable.FLAG_RUNNING)
+        remainingNs = self._remainingNs
+        if running:
+            remainingNs = max(0, self._deadline - monotonic_ns())
+        self._paused = bool(self._flags & SharedTimerTable.FLAG_PAUSED)
+        self.updateTime(remainingToTickMsecs(remainingNs, 1000))
+        self.arm(self._pollInterval if running else self._idlePollInterval)
+        if timedOut:
+            self.timeout.emit()
+
+    def arm(self, msecs: int) -> None:
+        if self._timerId and self._timerInterval == msecs:
+            return
+        if self._timerId:
+            self.killTimer(self._timerId)
+        self._timerId = self.startTimer(msecs, Qt.TimerType.CoarseTimer)
+        self._timerInterval = msecs
+
+    def updateTime(self, msecs: int) -> None:
+        oldMsecs = self._time.getMilliseconds()
+        if msecs == oldMsecs:
+            return
+        self._time.setMilliseconds(msecs)
+        self.timeChanged.emit()
+        self.timeValueChanged.emit(Time(msecs=msecs), Time(msecs=oldMsecs))
+
+    def isReadOnly(self) -> bool:
+        # Views check this and do not offer dragging or editing.
+        return True
+
+    def pause(self) -> None:
+        pass
+
+    def resume(self) -> None:
+        pass
+
+    def isPaused(self) -> bool:
+        return self._paused
+
+    def setTime(self, time: Time) -> None:
+        print("Error: A shared timer is read-only.")
+
+    def getTime(self) -> Time:
+        return self._time
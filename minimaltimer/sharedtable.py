@@ -0,0 +1,128 @@
+import struct
+from multiprocessing import shared_memory
+from time import monotonic_ns
+from minimaltimer.countdown import Countdown
+
+
+class SharedTimerTable:
+    # Fixed-size slots in shared memory, written by one process and read
+    # lock-free by any number of others. Every slot is guarded by a seqlock:
+    # the writer makes the sequence number odd while it updates the slot and
+    # even again afterwards, and a reader retries until it sees the same even
+    # number before and after reading. Deadlines are on the monotonic clock,
+    # which all processes on the machine share.
+    #
+    # A slot is (seq, flags, timeout count, remaining ns, deadline). Readers
+    # detect timeouts by the count changing, which unlike FLAG_EXPIRED
+    # survives the writer setting a new time before they poll again.
+    MAGIC = b'MTSH'
+    VERSION = 1
+    HEADER = struct.Struct('<4sHHI4x')
+    SEQ = struct.Struct('<Q')
+    SLOT = struct.Struct('<QIIqq')
+
+    FLAG_USED = 1
+    FLAG_PAUSED = 2
+    FLAG_RUNNING = 4
+    FLAG_EXPIRED = 8
+
+    READ_RETRIES = 10000
+
+    def __init__(self, name: str, slots: int = 0, create: bool = False) -> None:
+        self._owner = create
+        if create:
+            size = self.HEADER.size + slots * self.SLOT.size
+            self._shm = shared_memory.SharedMemory(name, create=True, size=size)
+            self._shm.buf[:size] = bytes(size)
+            self.HEADER.pack_into(self._shm.buf, 0, self.MAGIC, self.VERSION, 0, slots)
+        else:
+            self._shm = self.attachMemory(name)
+        magic, version, _, slots = self.HEADER.unpack_from(self._shm.buf, 0)
+        if magic != self.MAGIC or version != self.VERSION:
+            self._shm.close()
+            raise ValueError(f"{name!r} is not a timer table")
+        self._slots: int = slots
+
+    @staticmethod
+    def attachMemory(name: str) -> shared_memory.SharedMemory:
+        try:
+            return shared_memory.SharedMemory(name, track=False)
+        except TypeError:
+            # Before Python 3.13 the resource tracker would unlink the segment
+            # when a reader exits, so readers opt out of tracking by hand.
+            from multiprocessing import resource_tracker
+            shm = shared_memory.SharedMemory(name)
+            resource_tracker.unregister(shm._name, 'shared_memory')
+            return shm
+
+    def name(self) -> str:
+        return self._shm.name
+
+    def slotCount(self) -> int:
+        return self._slots
+
+    def close(self) -> None:
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+
+    def offset(self, index: int) -> int:
+        if not 0 <= index < self._slots:
+            raise IndexError(f"timer slot {index} out of range")
+        return self.HEADER.size + index * self.SLOT.size
+
+    def write(self, index: int, flags: int, remainingNs: int, deadline: int,
+              timedOut: bool = False) -> None:
+        offset = self.offset(index)
+        buf = self._shm.buf
+        seq, _, timeouts, _, _ = self.SLOT.unpack_from(buf, offset)
+        if timedOut:
+            timeouts = (timeouts + 1) & 0xFFFFFFFF
+        self.SEQ.pack_into(buf, offset, seq + 1)
+        self.SLOT.pack_into(buf, offset, seq + 1, flags | self.FLAG_USED, timeouts,
+                            remainingNs, deadline)
+        self.SEQ.pack_into(buf, offset, seq + 2)
+
+    def read(self, index: int) -> tuple:
+        # Returns (seq, flags, timeout count, remaining ns, monotonic deadline ns).
+        offset = self.offset(index)
+        buf = self._shm.buf
+        for _ in range(self.READ_RETRIES):
+            before = self.SEQ.unpack_from(buf, offset)[0]
+            if before & 1:
+                continue
+            seq, flags, timeouts, remainingNs, deadline = self.SLOT.unpack_from(buf, offset)
+            if self.SEQ.unpack_from(buf, offset)[0] == before == seq:
+                return (seq, flags, timeouts, remainingNs, deadline)
+        # The writer is stuck in the middle of an update, e.g. it died.
+        raise BlockingIOError(f"timer slot {index} is being written")
+
+    def seq(self, index: int) -> int:
+        # Cheap change check for pollers.
+        return self.SEQ.unpack_from(self._shm.buf, self.offset(index))[0]
+
+    def remainingNs(self, index: int) -> int:
+        _, flags, _, remainingNs, deadline = self.read(index)
+        if flags & self.FLAG_RUNNING:
+            return max(0, deadline - monotonic_ns())
+        return remainingNs
+
+    def writeCountdown(self, index: int, countdown: Countdown,
+                       expired: bool = False) -> None:
+        flags = 0
+        deadline = 0
+        remainingNs = countdown.remainingNs()
+        if countdown.isPaused():
+            flags |= self.FLAG_PAUSED
+        if countdown.isRunning():
+            flags |= self.FLAG_RUNNING
+            deadline = monotonic_ns() + remainingNs
+        if expired:
+            flags |= self.FLAG_EXPIRED
+        self.write(index, flags, remainingNs, deadline, expired)
+
+    def attach(self, index: int, countdown: Countdown) -> None:
+        # Written on state changes only, readers derive ticks from the deadline.
+        countdown.stateChanged.connect(lambda: self.writeCountdown(index, countdown))
+        countdown.timeout.connect(lambda: self.writeCountdown(index, countdown, True))
+        self.writeCountdown(index, countdown)
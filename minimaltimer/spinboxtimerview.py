@@ -0,0 +1,44 @@
+from qtpy.QtWidgets import QWidget, QSpinBox, QPushButton, QHBoxLayout
+from qtpy.QtCore import Slot
+from minimaltimer.abstracttimerview import AbstractTimerView
+from minimaltimer.time import Time
+
+class SpinboxTimerView(AbstractTimerView):
+    def __init__(self, parent: QWidget = None) -> None:
+        super().__init__(parent)
+        self._spinbox = QSpinBox()
+        self._startButton = QPushButton("Start")
+        self._editing = False
+        self.initUi()
+
+        self._spinbox.valueChanged.connect(self.onSpinboxValueChanged)
+        self._startButton.clicked.connect(self.onStartButtonClicked)
+
+    def initUi(self) -> None:
+        self.setLayout(QHBoxLayout())
+        self.layout().addWidget(self._spinbox)
+        self.layout().addWidget(self._startButton)
+
+    def setEngine(self, engine) -> None:
+        super().setEngine(engine)
+        readOnly = self.isEngineReadOnly()
+        self._spinbox.setReadOnly(readOnly)
+        self._startButton.setEnabled(not readOnly)
+
+    def handleTimeChanged(self, time: Time) -> None:
+        if self._editing == True:
+            # ignore 
+            return
+
+        wasBlocked = self._spinbox.blockSignals(True)
+        self._spinbox.setValue(time.getSeconds())
+        self._spinbox.blockSignals(wasBlocked)
+
+    @Slot()
+    def onSpinboxValueChanged(self) -> None:
+        self._editing = True
+
+    @Slot()
+    def onStartButtonClicked(self) -> None:
+        self._editing = False
+        self.setEngineTime(Time(self._spinbox.value()))
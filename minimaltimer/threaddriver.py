@@ -0,0 +1,81 @@
+import threading
+from minimaltimer.countdown import Countdown, NS_PER_MSEC
+from minimaltimer.time import Time
+
+
+class ThreadDriver:
+    def __init__(self, countdown: Countdown = None) -> None:
+        self._countdown = countdown or Countdown()
+        if self._countdown.clock().isVirtual():
+            # The thread sleeps in real time, a virtual clock would never
+            # catch up and the loop would spin with the lock held.
+            raise ValueError("ThreadDriver needs a real clock, "
+                             "advance a VirtualClock from the test instead")
+        # Guards the countdown, its callbacks run on the driver thread while
+        # this lock is held.
+        self._condition = threading.Condition(threading.RLock())
+        self._timedOut = threading.Event()
+        self._thread: threading.Thread = None
+        self._stopped = False
+
+        self._countdown.scheduleChanged.connect(self.wake)
+        self._countdown.timeout.connect(self._timedOut.set)
+
+    def countdown(self) -> Countdown:
+        return self._countdown
+
+    def lock(self) -> threading.Condition:
+        return self._condition
+
+    def start(self) -> None:
+        if self._thread:
+            return
+        self._stopped = False
+        self._thread = threading.Thread(target=self.run, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if not self._thread:
+            return
+        with self._condition:
+            self._stopped = True
+            self._condition.notify_all()
+        self._thread.join()
+        self._thread = None
+
+    def wake(self) -> None:
+        with self._condition:
+            self._condition.notify_all()
+
+    def run(self) -> None:
+        with self._condition:
+            while not self._stopped:
+                wakeup = self._countdown.nextWakeup()
+                if wakeup is None:
+                    self._condition.wait()
+                    continue
+                delay = wakeup - self._countdown.clock().now()
+                if delay > 0:
+                    self._condition.wait(delay / (1000 * NS_PER_MSEC))
+                    continue
+                self._countdown.tick()
+
+    def wait(self, timeout: float = None) -> bool:
+        return self._timedOut.wait(timeout)
+
+    def pause(self) -> None:
+        with self._condition:
+            self._countdown.pause()
+
+    def resume(self) -> None:
+        with self._condition:
+            self._countdown.resume()
+
+    def setTime(self, time: Time) -> None:
+        with self._condition:
+            self._timedOut.clear()
+            self._countdown.setTime(time)
+
+    def getTime(self) -> Time:
+        with self._condition:
+            return Time(msecs=self._countdown.getTime().getMilliseconds())
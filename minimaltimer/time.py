@@ -1,9 +1,40 @@
+from functools import total_ordering
+
+
+@total_ordering
 class Time:
-    def __init__(self, secs: int = 0) -> None:
-        self._secs = secs
+    # Compared and hashed by value. The engine updates its Time in place, so
+    # do not keep a mutable Time as a dict key or set member.
+    __slots__ = ('_msecs',)
+
+    def __init__(self, secs: int = 0, msecs: int = 0) -> None:
+        self._msecs = secs * 1000 + msecs
 
     def getSeconds(self) -> int:
-        return self._secs
+        # Partial seconds count as a whole second, as a countdown shows them.
+        return -(-self._msecs // 1000)
 
     def setSeconds(self, secs: int) -> None:
-        self._secs = secs
\ No newline at end of file
+        self._msecs = secs * 1000
+
+    def getMilliseconds(self) -> int:
+        return self._msecs
+
+    def setMilliseconds(self, msecs: int) -> None:
+        self._msecs = msecs
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Time):
+            return NotImplemented
+        return self._msecs == other._msecs
+
+    def __lt__(self, other: 'Time') -> bool:
+        if not isinstance(other, Time):
+            return NotImplemented
+        return self._msecs < other._msecs
+
+    def __hash__(self) -> int:
+        return hash(self._msecs)
+
+    def __repr__(self) -> str:
+        return f"Time(msecs={self._msecs})"
\ No newline at end of file
@@ -1,46 +1,109 @@
-from qtpy.QtCore import QObject, QTimerEvent
+from qtpy.QtCore import QObject
 from qtpy.QtCore import Signal
+from qtpy.QtGui import QGuiApplication
+from minimaltimer.clock import MonotonicClock
+from minimaltimer.countdown import Countdown
+from minimaltimer.metrics import activeMetrics
+from minimaltimer.qtalarm import QtAlarm
 from minimaltimer.time import Time
 
+# Tick interval that follows the refresh rate of the primary screen.
+DISPLAY_SYNC = -1
+
 
 class TimerEngine(QObject):
     timeChanged = Signal()
+    # (new Time, old Time)
+    timeValueChanged = Signal(object, object)
     timeout = Signal()
 
-    def __init__(self, parent: QObject = None) -> None:
+    def __init__(self, parent: QObject = None, interval: int = 1000,
+                 clock=None) -> None:
         super().__init__(parent)
-        self._time = Time()
-        self._timerId = self.startTimer(1000)
-        self._paused: bool = False
+        self._interval: int = interval
+        # With a VirtualClock the engine is woken by clock.advance() instead
+        # of Qt timers, so tests can run hours of countdown instantly.
+        self._clock = clock or MonotonicClock()
+        # The countdown logic lives in the Qt-free Countdown, this class only
+        # drives it from the Qt event loop and forwards its notifications.
+        self._countdown = Countdown(self.resolveTickInterval(interval), self._clock)
+        self._countdown.timeChanged.connect(self.timeChanged.emit)
+        self._countdown.timeValueChanged.connect(self.timeValueChanged.emit)
+        self._countdown.timeout.connect(self.timeout.emit)
+        self._countdown.scheduleChanged.connect(self.rearm)
+        # The Qt timer only exists while a countdown is running, so an idle
+        # or paused engine causes no wakeups at all.
+        self._alarm = QtAlarm(self._clock, self.wake, self)
+        self._wakeups: int = 0
+
+    def countdown(self) -> Countdown:
+        return self._countdown
+
+    def clock(self):
+        return self._clock
 
     def pause(self) -> None:
-        self._paused = True
+        self._countdown.pause()
 
     def resume(self) -> None:
-        self._paused = False
+        self._countdown.resume()
+
+    def isReadOnly(self) -> bool:
+        return False
 
     def isPaused(self) -> bool:
-        return self._paused
-        
-    def timerEvent(self, event: QTimerEvent) -> None:
-        if self.isPaused():
+        return self._countdown.isPaused()
+
+    def isRunning(self) -> bool:
+        return self._countdown.isRunning()
+
+    def wakeupCount(self) -> int:
+        return self._wakeups
+
+    def setTickInterval(self, msecs: int) -> None:
+        if msecs <= 0 and msecs != DISPLAY_SYNC:
+            # Invalid interval
             return
-        if self._time.getSeconds() == 0:
+        self._interval = msecs
+        self._countdown.setTickInterval(self.resolveTickInterval(msecs))
+
+    def tickInterval(self) -> int:
+        return self._interval
+
+    def resolveTickInterval(self, msecs: int) -> int:
+        if msecs != DISPLAY_SYNC:
+            return msecs
+        screen = QGuiApplication.primaryScreen()
+        rate = screen.refreshRate() if screen else 0
+        return max(1, round(1000 / rate)) if rate > 0 else 16
+
+    def rearm(self) -> None:
+        self._alarm.arm(self._countdown.nextWakeup())
+
+    def stopTimer(self) -> None:
+        self._alarm.disarm()
+
+    def wake(self) -> None:
+        self._wakeups += 1
+        if not self._countdown.isRunning():
             return
-        self._time.setSeconds(self._time.getSeconds() - 1)
-        self.timeChanged.emit()
-        #print(self._time.getSeconds())
-        if self._time.getSeconds() == 0:
-            self.timeout.emit()
+        metrics = activeMetrics()
+        if metrics:
+            metrics.recordTick(self._clock.now() - self._countdown.nextWakeup())
+        self._countdown.tick()
+
+    def beginUpdate(self) -> None:
+        self._countdown.beginUpdate()
+
+    def endUpdate(self) -> None:
+        self._countdown.endUpdate()
+
+    def batchUpdate(self):
+        # with engine.batchUpdate(): ... emits at most one timeChanged.
+        return self._countdown.batchUpdate()
 
     def setTime(self, time: Time) -> None:
-        if time.getSeconds() < 0:
-            # Invalid time
-            return
-        if self._time == time:
-            return
-        self._time = time
-        self.timeChanged.emit()
+        self._countdown.setTime(time)
 
     def getTime(self) -> Time:
-        return self._time
\ No newline at end of file
+        return self._countdown.getTime()
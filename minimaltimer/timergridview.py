@@ -0,0 +1,203 @@
+from contextlib import contextmanager
+from qtpy.QtWidgets import QWidget
+from qtpy.QtCore import QRect, QSize
+from qtpy.QtGui import QMouseEvent, QPainter, QPaintEvent, QResizeEvent
+from minimaltimer.time import Time
+from minimaltimer.timerengine import TimerEngine
+from minimaltimer.timerview import TimerView
+
+
+class TimerGridView(TimerView):
+    # Draws any number of engines as a grid of dials inside one widget. The
+    # TimerView geometry, face cache and mouse handling are reused by pointing
+    # clockRect() and getEngine() at one cell at a time.
+    DEFAULT_CELL_SIDE = 160
+
+    def __init__(self, parent: QWidget = None, cellSide: int = DEFAULT_CELL_SIDE) -> None:
+        super().__init__(parent)
+        self._cellSide = cellSide
+        self._engines = []
+        self._indices = {}
+        self._connections = {}
+        self._activeCell: int = -1
+        self._timedOutCells = set()
+
+    def addEngine(self, engine: TimerEngine) -> int:
+        def onTimeChanged(time: Time, oldTime: Time) -> None:
+            self.onCellTimeChanged(engine, time, oldTime)
+
+        def onTimeout() -> None:
+            self.onCellTimeout(engine)
+
+        engine.timeValueChanged.connect(onTimeChanged)
+        engine.timeout.connect(onTimeout)
+        self._connections[engine] = (onTimeChanged, onTimeout)
+        self._indices[engine] = len(self._engines)
+        self._engines.append(engine)
+        self.updateGridSize()
+        self.update(self.cellRect(len(self._engines) - 1))
+        return len(self._engines) - 1
+
+    def removeEngine(self, engine: TimerEngine) -> None:
+        if engine not in self._indices:
+            return
+        onTimeChanged, onTimeout = self._connections.pop(engine)
+        engine.timeValueChanged.disconnect(onTimeChanged)
+        engine.timeout.disconnect(onTimeout)
+        removed = self._indices[engine]
+        if self._activeCell == removed:
+            if self._dragging:
+                # Abandon the drag, the engine no longer belongs to a cell.
+                self._dragTimer.stop()
+                self._pendingDragPos = None
+                self._dragging = False
+                engine.resume()
+            self._activeCell = -1
+        elif self._activeCell > removed:
+            self._activeCell -= 1
+        self._timedOutCells = {index - (index > removed)
+                               for index in self._timedOutCells if index != removed}
+        self._engines.remove(engine)
+        self._indices = {e: index for index, e in enumerate(self._engines)}
+        self.updateGridSize()
+        # Every cell after the removed one moves.
+        self.update()
+
+    def engines(self) -> list:
+        return list(self._engines)
+
+    def setCellSide(self, side: int) -> None:
+        self._cellSide = max(1, side)
+        self.invalidateFace()
+        self.updateGridSize()
+        self.update()
+
+    def cellSide(self) -> int:
+        return self._cellSide
+
+    def columnCount(self) -> int:
+        return max(1, self.width() // self._cellSide)
+
+    def rowCount(self) -> int:
+        columns = self.columnCount()
+        return (len(self._engines) + columns - 1) // columns
+
+    def cellRect(self, index: int) -> QRect:
+        columns = self.columnCount()
+        return QRect((index % columns) * self._cellSide,
+                     (index // columns) * self._cellSide,
+                     self._cellSide, self._cellSide)
+
+    def cellAt(self, pos) -> int:
+        if pos.x() < 0 or pos.y() < 0:
+            return -1
+        column = pos.x() // self._cellSide
+        columns = self.columnCount()
+        if column >= columns:
+            return -1
+        index = (pos.y() // self._cellSide) * columns + column
+        return index if index < len(self._engines) else -1
+
+    def cellsIn(self, rect: QRect) -> list:
+        columns = self.columnCount()
+        side = self._cellSide
+        firstRow = max(0, rect.top() // side)
+        lastRow = min(self.rowCount() - 1, rect.bottom() // side)
+        firstColumn = max(0, rect.left() // side)
+        lastColumn = min(columns - 1, rect.right() // side)
+        cells = []
+        for row in range(firstRow, lastRow + 1):
+            for column in range(firstColumn, lastColumn + 1):
+                index = row * columns + column
+                if index < len(self._engines):
+                    cells.append(index)
+        return cells
+
+    @contextmanager
+    def activeCell(self, index: int):
+        previous = self._activeCell
+        self._activeCell = index
+        try:
+            yield
+        finally:
+            self._activeCell = previous
+
+    def clockRect(self) -> QRect:
+        if self._activeCell < 0:
+            return QRect(0, 0, self._cellSide, self._cellSide)
+        return self.cellRect(self._activeCell)
+
+    def getEngine(self) -> TimerEngine:
+        if 0 <= self._activeCell < len(self._engines):
+            return self._engines[self._activeCell]
+        return None
+
+    def updateGridSize(self) -> None:
+        self.setMinimumHeight(self.rowCount() * self._cellSide)
+
+    def sizeHint(self) -> QSize:
+        columns = max(1, min(len(self._engines), 4))
+        rows = (len(self._engines) + columns - 1) // columns
+        return QSize(columns * self._cellSide, max(1, rows) * self._cellSide)
+
+    def resizeEvent(self, event: QResizeEvent) -> None:
+        self.updateGridSize()
+        return super().resizeEvent(event)
+
+    def paintEvent(self, event: QPaintEvent) -> None:
+        # Only cells inside the exposed rectangle are painted, which for a
+        # grid inside a scroll area are the visible and changed ones.
+        painter = QPainter(self)
+        for index in self.cellsIn(event.rect()):
+            with self.activeCell(index):
+                painter.save()
+                self.paintClock(painter)
+                painter.restore()
+
+    def onCellTimeChanged(self, engine: TimerEngine, time: Time, oldTime: Time) -> None:
+        index = self._indices.get(engine)
+        if index is None:
+            return
+        with self.activeCell(index):
+            if time.getMilliseconds() > 0 and self.isTimedOut():
+                self.setTimedOut(False)
+            self.requestPaint(self.handDirtyRect(oldTime.getMilliseconds() / 1000,
+                                                 time.getMilliseconds() / 1000))
+
+    def onCellTimeout(self, engine: TimerEngine) -> None:
+        index = self._indices.get(engine)
+        if index is None:
+            return
+        with self.activeCell(index):
+            self.handleTimeout()
+
+    def isTimedOut(self) -> bool:
+        return self._activeCell in self._timedOutCells
+
+    def setTimedOut(self, timedOut: bool) -> None:
+        if timedOut == self.isTimedOut() or self._activeCell < 0:
+            return
+        if timedOut:
+            self._timedOutCells.add(self._activeCell)
+        else:
+            self._timedOutCells.discard(self._activeCell)
+        self.requestPaint(self.clockRect())
+
+    def mousePressEvent(self, event: QMouseEvent) -> None:
+        if not self._dragging:
+            self._activeCell = self.cellAt(event.pos())
+            if self._activeCell < 0:
+                return QWidget.mousePressEvent(self, event)
+        return super().mousePressEvent(event)
+
+    def mouseMoveEvent(self, event: QMouseEvent) -> None:
+        if not self._dragging:
+            self._activeCell = self.cellAt(event.pos())
+            if self._activeCell < 0:
+                return QWidget.mouseMoveEvent(self, event)
+        return super().mouseMoveEvent(event)
+
+    def mouseReleaseEvent(self, event: QMouseEvent) -> None:
+        super().mouseReleaseEvent(event)
+        if not self._dragging:
+            self._activeCell = -1
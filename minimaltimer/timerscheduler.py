@@ -0,0 +1,143 @@
+import heapq
+from qtpy.QtCore import QObject
+from qtpy.QtCore import Signal
+from minimaltimer.clock import MonotonicClock
+from minimaltimer.time import Time
+from minimaltimer.countdown import NS_PER_MSEC, nsecsToNextTick, remainingToTickMsecs
+from minimaltimer.metrics import activeMetrics
+from minimaltimer.qtalarm import QtAlarm
+
+
+class ScheduledTimer:
+    def __init__(self, time: Time) -> None:
+        self.time = Time(msecs=time.getMilliseconds())
+        self.paused = False
+        self.deadline: int = None
+        self.remainingNs = time.getMilliseconds() * NS_PER_MSEC
+        # Bumped on every reschedule so stale heap entries can be skipped.
+        self.generation = 0
+
+
+class TimerScheduler(QObject):
+    # Many countdowns on one Qt timer, each woken exactly at its own tick
+    # boundary through a heap, with a Qt signal per timer id. For very large
+    # numbers of timers see TimerStore, which trades that precision for one
+    # array pass per wakeup.
+    timeChanged = Signal(int)
+    timeout = Signal(int)
+
+    def __init__(self, parent: QObject = None, interval: int = 1000,
+                 clock=None) -> None:
+        super().__init__(parent)
+        self._interval = interval
+        # As in TimerEngine, a VirtualClock replaces the Qt timer.
+        self._clock = clock or MonotonicClock()
+        self._timers = {}
+        self._nextId = 1
+        # (wakeup, timer id, generation) for every running countdown, so only
+        # the earliest wakeup has to be armed as a Qt timer.
+        self._heap = []
+        self._alarm = QtAlarm(self._clock, self.wake, self)
+
+    def clock(self):
+        return self._clock
+
+    def addTimer(self, time: Time = None) -> int:
+        timerId = self._nextId
+        self._nextId += 1
+        self._timers[timerId] = ScheduledTimer(time or Time())
+        self.schedule(timerId)
+        return timerId
+
+    def removeTimer(self, timerId: int) -> None:
+        # Its heap entries become stale and are dropped when they surface.
+        self._timers.pop(timerId, None)
+
+    def timerIds(self) -> list:
+        return list(self._timers)
+
+    def count(self) -> int:
+        return len(self._timers)
+
+    def getTime(self, timerId: int) -> Time:
+        return self._timers[timerId].time
+
+    def setTime(self, timerId: int, time: Time) -> None:
+        if time.getMilliseconds() < 0:
+            # Invalid time
+            return
+        timer = self._timers[timerId]
+        changed = timer.time != time
+        timer.time.setMilliseconds(time.getMilliseconds())
+        timer.remainingNs = time.getMilliseconds() * NS_PER_MSEC
+        self.schedule(timerId)
+        if changed:
+            self.timeChanged.emit(timerId)
+
+    def pause(self, timerId: int) -> None:
+        timer = self._timers[timerId]
+        if timer.paused:
+            return
+        if timer.deadline is not None:
+            timer.remainingNs = max(0, timer.deadline - self._clock.now())
+        timer.paused = True
+        self.schedule(timerId)
+
+    def resume(self, timerId: int) -> None:
+        timer = self._timers[timerId]
+        if not timer.paused:
+            return
+        timer.paused = False
+        self.schedule(timerId)
+
+    def isPaused(self, timerId: int) -> bool:
+        return self._timers[timerId].paused
+
+    def schedule(self, timerId: int) -> None:
+        timer = self._timers[timerId]
+        timer.generation += 1
+        if timer.paused or timer.remainingNs <= 0:
+            timer.deadline = None
+            return
+        now = self._clock.now()
+        timer.deadline = now + timer.remainingNs
+        self.push(timerId, timer, now)
+        self.arm()
+
+    def push(self, timerId: int, timer: ScheduledTimer, now: int) -> None:
+        wakeup = now + nsecsToNextTick(timer.deadline - now, self._interval)
+        heapq.heappush(self._heap, (wakeup, timerId, timer.generation))
+
+    def arm(self) -> None:
+        self._alarm.arm(self._heap[0][0] if self._heap else None)
+
+    def disarm(self) -> None:
+        self._alarm.disarm()
+
+    def wake(self) -> None:
+        now = self._clock.now()
+        changed = []
+        metrics = activeMetrics()
+        while self._heap and self._heap[0][0] <= now:
+            wakeup, timerId, generation = heapq.heappop(self._heap)
+            timer = self._timers.get(timerId)
+            if timer is None or timer.generation != generation:
+                continue
+            if metrics:
+                metrics.recordTick(now - wakeup)
+            timer.remainingNs = max(0, timer.deadline - now)
+            msecs = remainingToTickMsecs(timer.remainingNs, self._interval)
+            if msecs == 0:
+                timer.deadline = None
+            else:
+                self.push(timerId, timer, now)
+            if msecs != timer.time.getMilliseconds():
+                timer.time.setMilliseconds(msecs)
+                changed.append((timerId, msecs == 0))
+
+        self.arm()
+        # Emit after the heap is consistent, listeners may reschedule timers.
+        for timerId, timedOut in changed:
+            self.timeChanged.emit(timerId)
+            if timedOut:
+                self.timeout.emit(timerId)
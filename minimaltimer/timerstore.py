@@ -0,0 +1,346 @@
+from array import array
+from minimaltimer.clock import MonotonicClock
+from minimaltimer.countdown import NS_PER_MSEC, Notifier, nsecsToNextTick, remainingToTickMsecs
+from minimaltimer.time import Time
+
+try:
+    import numpy
+except ImportError:
+    # Without NumPy tick() falls back to a plain loop with the same results.
+    numpy = None
+
+
+class StoredTimer:
+    # Engine-style view of one slot of a TimerStore. Views hold no state of
+    # their own, so they are cheap to create and any number may exist. They
+    # offer the interface AbstractTimerView.setEngine() uses, with plain
+    # Notifiers instead of Qt signals, called from TimerStore.tick().
+    __slots__ = ('_store', '_index')
+
+    def __init__(self, store: 'TimerStore', index: int) -> None:
+        self._store = store
+        self._index = index
+
+    def index(self) -> int:
+        return self._index
+
+    def pause(self) -> None:
+        self._store.pause(self._index)
+
+    def resume(self) -> None:
+        self._store.resume(self._index)
+
+    def isPaused(self) -> bool:
+        return self._store.isPaused(self._index)
+
+    def isReadOnly(self) -> bool:
+        return False
+
+    def isRunning(self) -> bool:
+        return self._store.isRunning(self._index)
+
+    def remainingNs(self) -> int:
+        return self._store.remainingNs(self._index)
+
+    def setTime(self, time: Time) -> None:
+        self._store.setTime(self._index, time)
+
+    def getTime(self) -> Time:
+        return self._store.getTime(self._index)
+
+    @property
+    def timeChanged(self) -> Notifier:
+        return self._store.timeChangedNotifier(self._index)
+
+    @property
+    def timeValueChanged(self) -> Notifier:
+        # Called with (new Time, old Time).
+        return self._store.timeValueChangedNotifier(self._index)
+
+    @property
+    def timeout(self) -> Notifier:
+        return self._store.timeoutNotifier(self._index)
+
+
+class TimerStore:
+    # Keeps many countdowns in fixed-size arrays instead of one Countdown
+    # object each. A tick computes the remaining time of every running slot
+    # in one pass, vectorized with NumPy when it is installed.
+    #
+    # The whole store wakes up at the earliest tick boundary of any slot, but
+    # no more often than every `resolution` ms, so with many timers the
+    # displayed time and timeouts may lag by up to that much.
+    #
+    # TimerScheduler wakes every timer exactly on its own boundary, which is
+    # better up to a few thousand timers. Beyond that its per-timer heap
+    # operations and Qt signals dominate, and the store's single vectorized
+    # pass with batched notifications is cheaper.
+    FLAG_USED = 1
+    FLAG_PAUSED = 2
+    FLAG_RUNNING = 4
+
+    def __init__(self, capacity: int, interval: int = 1000, resolution: int = 50,
+                 clock=None) -> None:
+        self._clock = clock or MonotonicClock()
+        self._capacity = capacity
+        self._interval: int = interval
+        self._resolution: int = resolution
+        # Called with the list of changed or expired slot indices, once per
+        # tick for all slots.
+        self.timeChanged = Notifier()
+        self.timeout = Notifier()
+        # Emitted whenever nextWakeup() changes so a driver can re-arm.
+        self.scheduleChanged = Notifier()
+
+        # Struct of arrays. The deadline is on the clock while running, the
+        # remaining time is kept instead while paused or stopped, and msecs is
+        # the displayed time rounded up to the tick interval.
+        self._deadline = array('q', bytes(8 * capacity))
+        self._remaining = array('q', bytes(8 * capacity))
+        self._msecs = array('q', bytes(8 * capacity))
+        self._flags = array('B', bytes(capacity))
+        # The arrays never grow, so NumPy views on their memory stay valid.
+        self._views = None
+        if numpy is not None:
+            self._views = (numpy.frombuffer(self._deadline, dtype=numpy.int64),
+                           numpy.frombuffer(self._remaining, dtype=numpy.int64),
+                           numpy.frombuffer(self._msecs, dtype=numpy.int64),
+                           numpy.frombuffer(self._flags, dtype=numpy.uint8))
+        # Slots below _size have been used, freed ones are reused first.
+        self._size: int = 0
+        self._free = []
+        self._count: int = 0
+        self._running: int = 0
+        self._wakeup: int = None
+        # Per-slot notifiers only exist for slots somebody listens to.
+        self._timeChangedNotifiers = {}
+        self._timeValueChangedNotifiers = {}
+        self._timeoutNotifiers = {}
+
+    def clock(self):
+        return self._clock
+
+    def capacity(self) -> int:
+        return self._capacity
+
+    def count(self) -> int:
+        return self._count
+
+    def runningCount(self) -> int:
+        return self._running
+
+    def add(self, time: Time = None) -> StoredTimer:
+        if self._free:
+            index = self._free.pop()
+        elif self._size < self._capacity:
+            index = self._size
+            self._size += 1
+        else:
+            raise IndexError(f"timer store is full ({self._capacity} timers)")
+        self._flags[index] = self.FLAG_USED
+        self._count += 1
+        if time is not None:
+            self.setTime(index, time)
+        return StoredTimer(self, index)
+
+    def remove(self, index: int) -> None:
+        self.check(index)
+        if self._flags[index] & self.FLAG_RUNNING:
+            self._running -= 1
+        self._flags[index] = 0
+        self._deadline[index] = 0
+        self._remaining[index] = 0
+        self._msecs[index] = 0
+        self._timeChangedNotifiers.pop(index, None)
+        self._timeValueChangedNotifiers.pop(index, None)
+        self._timeoutNotifiers.pop(index, None)
+        self._free.append(index)
+        self._count -= 1
+        if not self._running and self._wakeup is not None:
+            self._wakeup = None
+            self.scheduleChanged.emit()
+
+    def timer(self, index: int) -> StoredTimer:
+        self.check(index)
+        return StoredTimer(self, index)
+
+    def check(self, index: int) -> None:
+        if not (0 <= index < self._size and self._flags[index] & self.FLAG_USED):
+            raise IndexError(f"timer slot {index} is not in use")
+
+    def timeChangedNotifier(self, index: int) -> Notifier:
+        self.check(index)
+        return self._timeChangedNotifiers.setdefault(index, Notifier())
+
+    def timeValueChangedNotifier(self, index: int) -> Notifier:
+        self.check(index)
+        return self._timeValueChangedNotifiers.setdefault(index, Notifier())
+
+    def timeoutNotifier(self, index: int) -> Notifier:
+        self.check(index)
+        return self._timeoutNotifiers.setdefault(index, Notifier())
+
+    def getTime(self, index: int) -> Time:
+        self.check(index)
+        return Time(msecs=self._msecs[index])
+
+    def setTime(self, index: int, time: Time) -> None:
+        msecs = time.getMilliseconds()
+        if msecs < 0:
+            # Invalid time
+            return
+        self.check(index)
+        oldMsecs = self._msecs[index]
+        self._msecs[index] = msecs
+        self._remaining[index] = msecs * NS_PER_MSEC
+        self.startSlot(index)
+        if oldMsecs != msecs:
+            self.notifyTimeChanged([index], [oldMsecs])
+
+    def pause(self, index: int) -> None:
+        self.check(index)
+        flags = self._flags[index]
+        if flags & self.FLAG_PAUSED:
+            return
+        if flags & self.FLAG_RUNNING:
+            self._remaining[index] = max(0, self._deadline[index] - self._clock.now())
+        self._flags[index] = flags | self.FLAG_PAUSED
+        self.startSlot(index)
+
+    def resume(self, index: int) -> None:
+        self.check(index)
+        flags = self._flags[index]
+        if not flags & self.FLAG_PAUSED:
+            return
+        self._flags[index] = flags & ~self.FLAG_PAUSED
+        self.startSlot(index)
+
+    def isPaused(self, index: int) -> bool:
+        self.check(index)
+        return bool(self._flags[index] & self.FLAG_PAUSED)
+
+    def isRunning(self, index: int) -> bool:
+        self.check(index)
+        return bool(self._flags[index] & self.FLAG_RUNNING)
+
+    def remainingNs(self, index: int) -> int:
+        self.check(index)
+        if self._flags[index] & self.FLAG_RUNNING:
+            return max(0, self._deadline[index] - self._clock.now())
+        return self._remaining[index]
+
+    def nextWakeup(self) -> int:
+        # Time in ns on the store's clock at which tick() should be called
+        # next, or None while nothing is counting down.
+        return self._wakeup
+
+    def startSlot(self, index: int) -> None:
+        flags = self._flags[index]
+        wasRunning = flags & self.FLAG_RUNNING
+        remainingNs = self._remaining[index]
+        if flags & self.FLAG_PAUSED or remainingNs <= 0:
+            self._flags[index] = flags & ~self.FLAG_RUNNING
+            self._deadline[index] = 0
+            if wasRunning:
+                self._running -= 1
+            if not self._running and self._wakeup is not None:
+                self._wakeup = None
+                self.scheduleChanged.emit()
+            return
+        now = self._clock.now()
+        self._flags[index] = flags | self.FLAG_RUNNING
+        self._deadline[index] = now + remainingNs
+        if not wasRunning:
+            self._running += 1
+        wakeup = now + nsecsToNextTick(remainingNs, self._interval)
+        if self._wakeup is None or wakeup < self._wakeup:
+            self._wakeup = wakeup
+            self.scheduleChanged.emit()
+
+    def tick(self) -> None:
+        if not self._running:
+            return
+        now = self._clock.now()
+        if self._views is not None:
+            changed, oldMsecs, expired, nextNs = self.tickVectorized(now)
+        else:
+            changed, oldMsecs, expired, nextNs = self.tickLoop(now)
+        self._running -= len(expired)
+        if self._running:
+            self._wakeup = now + max(nextNs, self._resolution * NS_PER_MSEC)
+        else:
+            self._wakeup = None
+        self.scheduleChanged.emit()
+        if changed:
+            self.notifyTimeChanged(changed, oldMsecs)
+        if expired:
+            self.notifyTimeout(expired)
+
+    def tickVectorized(self, now: int) -> tuple:
+        deadline, remaining, msecs, flags = self._views
+        running = numpy.flatnonzero(flags[:self._size] & self.FLAG_RUNNING)
+        left = numpy.maximum(deadline[running] - now, 0)
+        ticked = remainingToTickMsecs(left, self._interval)
+        changedMask = ticked != msecs[running]
+        changed = running[changedMask]
+        oldMsecs = msecs[changed]
+        msecs[changed] = ticked[changedMask]
+        expiredMask = left == 0
+        expired = running[expiredMask]
+        flags[expired] -= self.FLAG_RUNNING
+        deadline[expired] = 0
+        remaining[expired] = 0
+        nextNs = self._interval * NS_PER_MSEC
+        live = left[~expiredMask]
+        if len(live):
+            nextNs = int(nsecsToNextTick(live, self._interval).min())
+        return changed.tolist(), oldMsecs.tolist(), expired.tolist(), nextNs
+
+    def tickLoop(self, now: int) -> tuple:
+        deadline, remaining = self._deadline, self._remaining
+        msecs, flags = self._msecs, self._flags
+        changed = []
+        oldMsecs = []
+        expired = []
+        nextNs = self._interval * NS_PER_MSEC
+        for index in range(self._size):
+            if not flags[index] & self.FLAG_RUNNING:
+                continue
+            left = max(0, deadline[index] - now)
+            ticked = remainingToTickMsecs(left, self._interval)
+            if ticked != msecs[index]:
+                oldMsecs.append(msecs[index])
+                msecs[index] = ticked
+                changed.append(index)
+            if left == 0:
+                flags[index] -= self.FLAG_RUNNING
+                deadline[index] = 0
+                remaining[index] = 0
+                expired.append(index)
+            else:
+                nextNs = min(nextNs, nsecsToNextTick(left, self._interval))
+        return changed, oldMsecs, expired, nextNs
+
+    def notifyTimeChanged(self, indices: list, oldMsecs: list) -> None:
+        self.timeChanged.emit(indices)
+        notifiers = self._timeChangedNotifiers
+        if notifiers:
+            for index in indices:
+                notifier = notifiers.get(index)
+                if notifier:
+                    notifier.emit()
+        notifiers = self._timeValueChangedNotifiers
+        if notifiers:
+            for index, old in zip(indices, oldMsecs):
+                notifier = notifiers.get(index)
+                if notifier:
+                    notifier.emit(Time(msecs=self._msecs[index]), Time(msecs=old))
+
+    def notifyTimeout(self, indices: list) -> None:
+        self.timeout.emit(indices)
+        notifiers = self._timeoutNotifiers
+        if notifiers:
+            for index in indices:
+                notifier = notifiers.get(index)
+                if notifier:
+                    notifier.emit()
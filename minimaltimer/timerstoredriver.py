@@ -0,0 +1,34 @@
+from qtpy.QtCore import QObject
+from minimaltimer.metrics import activeMetrics
+from minimaltimer.qtalarm import QtAlarm
+from minimaltimer.timerstore import TimerStore
+
+
+class TimerStoreDriver(QObject):
+    # Drives a TimerStore from the Qt event loop with a single Qt timer for
+    # all of its slots, or from clock.advance() on a VirtualClock.
+    def __init__(self, store: TimerStore, parent: QObject = None) -> None:
+        super().__init__(parent)
+        self._store = store
+        self._alarm = QtAlarm(store.clock(), self.wake, self)
+        store.scheduleChanged.connect(self.rearm)
+        self.rearm()
+
+    def store(self) -> TimerStore:
+        return self._store
+
+    def close(self) -> None:
+        self._alarm.disarm()
+        self._store.scheduleChanged.disconnect(self.rearm)
+
+    def rearm(self) -> None:
+        self._alarm.arm(self._store.nextWakeup())
+
+    def wake(self) -> None:
+        wakeup = self._store.nextWakeup()
+        if wakeup is None:
+            return
+        metrics = activeMetrics()
+        if metrics:
+            metrics.recordTick(self._store.clock().now() - wakeup)
+        self._store.tick()
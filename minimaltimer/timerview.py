@@ -1,223 +1,389 @@
-from cmath import cos, pi, sin, sqrt
-from math import atan2
-from qtpy.QtWidgets import *
-from qtpy.QtCore import *
-from qtpy.QtGui import *
-from minimaltimer.timerengine import TimerEngine
+from math import atan2, pi
+from time import perf_counter_ns
+from qtpy.QtWidgets import QWidget
+from qtpy.QtCore import Qt, QEvent, QLineF, QPoint, QPointF, QRect, QRectF, QTimer
+from qtpy.QtGui import (QColor, QMouseEvent, QPainter, QPainterPath,
+                        QPaintEvent, QPen, QPixmap, QResizeEvent)
+from minimaltimer.abstracttimerview import AbstractTimerView
+from minimaltimer.clockgeometry import ClockGeometry, clockGeometry
+from minimaltimer.labelcache import LabelCache, sharedLabelCache
+from minimaltimer.metrics import activeMetrics
+from minimaltimer.notifications import TimeoutNotifier, sharedTimeoutNotifier
+from minimaltimer.rendercache import RenderCache, sharedRenderCache
 from minimaltimer.time import Time
 
-class AbstractTimerView(QWidget):
-    def __init__(self, parent: QWidget = None) -> None:
-        super().__init__(parent)
-        self._engine = None
-
-    def setEngine(self, engine: TimerEngine) -> None:
-        self._engine = engine
-        if self._engine:
-            self._engine.timeChanged.connect(self.onEngineTimeChanged)
-            self._engine.timeout.connect(self.onEngineTimeout)
-            self.handleTimeChanged(self._engine.getTime())
-
-    def handleTimeChanged(self, time: Time) -> None:
-        pass
-
-    def handleTimeout(self) -> None:
-        pass
-
-    def getEngineTime(self) -> Time:
-        if not self._engine:
-            return Time()
-        return self._engine.getTime()
-
-    def setEngineTime(self, time: Time) -> None:
-        if not self._engine:
-            print("Error: A timer engine is not exist.")
-            return
-        self._engine.setTime(time)
-
-    @Slot()
-    def onEngineTimeChanged(self) -> None:
-        if not self._engine:
-            return
-        self.handleTimeChanged(self._engine.getTime())
-
-    @Slot()
-    def onEngineTimeout(self) -> None:
-        if not self._engine:
-            return
-        self.handleTimeout()
 
+def __getattr__(name: str):
+    # SpinboxTimerView moved to its own module so that startup only imports
+    # the views that are actually shown.
+    if name == 'SpinboxTimerView':
+        from minimaltimer.spinboxtimerview import SpinboxTimerView
+        return SpinboxTimerView
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-class SpinboxTimerView(AbstractTimerView):
-    def __init__(self, parent: QWidget = None) -> None:
-        super().__init__(parent)
-        self._spinbox = QSpinBox()
-        self._startButton = QPushButton("Start")
-        self._editing = False
-        self.initUi()
 
-        self._spinbox.valueChanged.connect(self.onSpinboxValueChanged)
-        self._startButton.clicked.connect(self.onStartButtonClicked)
+# Colors of the dial per theme as RGBA tuples.
+THEMES = {
+    'default': {'scale': (0, 0, 0, 255), 'hand': (255, 0, 0, 255),
+                'overlay': (255, 255, 255, 220), 'overlayText': (0, 0, 0, 255)},
+    'dark': {'scale': (230, 230, 230, 255), 'hand': (255, 90, 70, 255),
+             'overlay': (40, 40, 40, 220), 'overlayText': (230, 230, 230, 255)},
+}
 
-    def initUi(self) -> None:
-        self.setLayout(QHBoxLayout())
-        self.layout().addWidget(self._spinbox)
-        self.layout().addWidget(self._startButton)
 
-    def handleTimeChanged(self, time: Time) -> None:
-        if self._editing == True:
-            # ignore 
-            return
+BACKEND_RASTER = 'raster'
+BACKEND_OPENGL = 'opengl'
 
-        wasBlocked = self._spinbox.blockSignals(True)
-        self._spinbox.setValue(time.getSeconds())
-        self._spinbox.blockSignals(wasBlocked)
 
-    @Slot()
-    def onSpinboxValueChanged(self) -> None:
-        self._editing = True
+def createTimerView(backend: str = BACKEND_RASTER, parent: QWidget = None) -> 'TimerView':
+    if backend == BACKEND_OPENGL:
+        # Imported on demand so the raster backend never loads OpenGL.
+        from minimaltimer.gltimerview import GLTimerView
+        return GLTimerView(parent)
+    if backend != BACKEND_RASTER:
+        raise ValueError(f"Unknown TimerView backend: {backend!r}")
+    return TimerView(parent)
 
-    @Slot()
-    def onStartButtonClicked(self) -> None:
-        self._editing = False
-        self.setEngineTime(Time(self._spinbox.value()))
 
 class TimerView(AbstractTimerView):
     WINDOW_SIDE = 1000
     CIRCLE_RADIUS = 400
     TEXT_RADIUS = 450
+    DRAG_FRAME_INTERVAL = 16
+    SNAP_SECOND = 1
+    SNAP_MINUTE = 60
 
     def __init__(self, parent: QWidget = None) -> None:
         super().__init__(parent)
         self._dragging = False
+        self._facePixmap: QPixmap = None
+        self._faceKey = None
+        self._coalesceUpdates = True
+        self._handSeconds: float = None
+        self._paintPending = False
+        self._timedOut = False
+        self._timeoutNotifier: TimeoutNotifier = sharedTimeoutNotifier()
+        self._labelCache: LabelCache = sharedLabelCache()
+        self._renderCache: RenderCache = sharedRenderCache()
+        self._theme: str = 'default'
+        self._throttleDrag = True
+        self._dragSnap: int = self.SNAP_SECOND
+        self._pendingDragPos: QPoint = None
+        self._dragTimer = QTimer(self)
+        self._dragTimer.setSingleShot(True)
+        self._dragTimer.setInterval(self.DRAG_FRAME_INTERVAL)
+        self._dragTimer.timeout.connect(self.flushDrag)
+
+    def clockRect(self) -> QRect:
+        # Area the clock is laid out in, the whole widget by default.
+        return self.rect()
 
     def getRadius(self) -> int:
-        side = min(self.width(), self.height())
+        rect = self.clockRect()
+        side = min(rect.width(), rect.height())
         return side // 2
 
-    def isPosInClock(self, pos: QPoint) -> bool:
-        center = self.rect().center()
-
-        def distance(p1: QPoint, p2: QPoint) -> float:
-            return sqrt((p1.x() - p2.x())**2 + (p1.y() - p2.y())**2).real
+    def getGeometry(self) -> ClockGeometry:
+        return clockGeometry(self.CIRCLE_RADIUS, self.TEXT_RADIUS)
 
-        return distance(pos, center) <= self.getRadius()
-
-    def paintEvent(self, event: QPaintEvent) -> None:
-        painter = QPainter(self)
-        side = min(self.width(), self.height())
-        painter.setViewport((self.width() - side) // 2, 
-                            (self.height() - side) // 2,
-                            side, side)
+    def isPosInClock(self, pos: QPoint) -> bool:
+        center = self.clockRect().center()
+        dx = pos.x() - center.x()
+        dy = pos.y() - center.y()
+        radius = self.getRadius()
+        return dx * dx + dy * dy <= radius * radius
+
+    def setupPainter(self, painter: QPainter, x: int, y: int, side: int) -> None:
+        painter.setViewport(x, y, side, side)
         painter.setWindow(-self.WINDOW_SIDE // 2, -self.WINDOW_SIDE // 2,
                           self.WINDOW_SIDE, self.WINDOW_SIDE)
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-        self.drawClockScale(painter)
+
+    def paintEvent(self, event: QPaintEvent) -> None:
+        painter = QPainter(self)
+        self.paintClock(painter)
+
+    def paintClock(self, painter: QPainter) -> None:
+        metrics = activeMetrics()
+        if metrics:
+            start = perf_counter_ns()
+        self._paintPending = False
+        rect = self.clockRect()
+        side = min(rect.width(), rect.height())
+        x = rect.x() + (rect.width() - side) // 2
+        y = rect.y() + (rect.height() - side) // 2
+        painter.drawPixmap(x, y, self.getFacePixmap())
+        self.setupPainter(painter, x, y, side)
         self.drawClockHand(painter)
+        if self.isTimedOut():
+            self.drawTimeoutOverlay(painter)
+        if metrics:
+            metrics.recordPaint(start, perf_counter_ns())
+
+    def getFacePixmap(self) -> QPixmap:
+        # The clock scale never changes for a given size, so it is rendered
+        # once into a pixmap and blitted under the hand on every paint.
+        # Views with the same geometry share the pixmap through the render
+        # cache unless it has been disabled with setRenderCache(None).
+        rect = self.clockRect()
+        side = min(rect.width(), rect.height())
+        dpr = self.devicePixelRatioF()
+        # Everything renderFace() depends on, so views that draw a different
+        # face never get each other's pixmap from the shared cache.
+        key = (type(self).__name__, self.CIRCLE_RADIUS, self.TEXT_RADIUS,
+               side, dpr, self._theme, self.font().key())
+        if self._facePixmap is None or self._faceKey != key:
+            if self._renderCache is None:
+                self._facePixmap = self.renderFace(side, dpr)
+            else:
+                self._facePixmap = self._renderCache.get(
+                    key, lambda: self.renderFace(side, dpr))
+            self._faceKey = key
+        return self._facePixmap
+
+    def renderFace(self, side: int, dpr: float) -> QPixmap:
+        pixmap = QPixmap(max(1, round(side * dpr)), max(1, round(side * dpr)))
+        pixmap.setDevicePixelRatio(dpr)
+        pixmap.fill(Qt.GlobalColor.transparent)
+        painter = QPainter(pixmap)
+        painter.setFont(self.font())
+        self.setupPainter(painter, 0, 0, side)
+        self.drawClockScale(painter)
+        painter.end()
+        return pixmap
 
-    def drawClockScale(self, painter: QPainter) -> None:
-        painter.save()
+    def setTheme(self, theme: str) -> None:
+        if theme not in THEMES:
+            raise ValueError(f"Unknown theme: {theme!r}")
+        self._theme = theme
+        self.invalidateFace()
+        self.requestPaint(self.rect())
+
+    def theme(self) -> str:
+        return self._theme
 
-        def getX(secs: int) -> float:
-            rad = self.secondsToRadian(secs)
-            return sin(rad).real
+    def themeColor(self, role: str) -> QColor:
+        return QColor(*THEMES[self._theme][role])
 
-        def getY(secs: int) -> float:
-            rad = self.secondsToRadian(secs)
-            return -cos(rad).real
+    def setRenderCache(self, cache: RenderCache) -> None:
+        self._renderCache = cache
+        self.invalidateFace()
+
+    def setLabelCache(self, cache: LabelCache) -> None:
+        self._labelCache = cache
+        self.invalidateFace()
+
+    def invalidateFace(self) -> None:
+        self._facePixmap = None
+        self._faceKey = None
+
+    def resizeEvent(self, event: QResizeEvent) -> None:
+        self.invalidateFace()
+        return super().resizeEvent(event)
+
+    def changeEvent(self, event: QEvent) -> None:
+        if event.type() == QEvent.Type.FontChange:
+            self.invalidateFace()
+        return super().changeEvent(event)
+
+    def drawClockScale(self, painter: QPainter) -> None:
+        painter.save()
+        geometry = self.getGeometry()
 
         # Draw small ticks
-        smallPen = QPen()
+        smallPen = QPen(self.themeColor('scale'))
         smallPen.setWidth(0)
         painter.setPen(smallPen)
-        for min in range(0, 60):
-            secs = min * 60
-            rad = self.secondsToRadian(secs)
-            x1 = (self.CIRCLE_RADIUS - 10) * getX(secs)
-            y1 = (self.CIRCLE_RADIUS - 10) * getY(secs)
-            x2 = (self.CIRCLE_RADIUS + 10) * getX(secs)
-            y2 = (self.CIRCLE_RADIUS + 10) * getY(secs)
+        for x1, y1, x2, y2 in geometry.smallTicks:
             painter.drawLine(QLineF(x1, y1, x2, y2))
 
         # Draw big ticks
-        bigPen = QPen()
+        bigPen = QPen(self.themeColor('scale'))
         bigPen.setWidth(5)
         painter.setPen(bigPen)
-        for min in range(0, 60, 5):
-            secs = min * 60
-            rad = self.secondsToRadian(secs)
-            x1 = (self.CIRCLE_RADIUS - 12) * getX(secs)
-            y1 = (self.CIRCLE_RADIUS - 12) * getY(secs)
-            x2 = (self.CIRCLE_RADIUS + 12) * getX(secs)
-            y2 = (self.CIRCLE_RADIUS + 12) * getY(secs)
+        for x1, y1, x2, y2 in geometry.bigTicks:
             painter.drawLine(QLineF(x1, y1, x2, y2))
 
         # Draw text
         font = painter.font()
         font.setPointSize(30)
-
-        textPen = QPen()
-        textPen.setWidth(0)
-
-        painter.setPen(textPen)
-        painter.setBrush(Qt.GlobalColor.black)
-        fontMetrics = QFontMetrics(font)
-
-        textPath = QPainterPath()
-        for min in range(0, 60, 5):
-            secs = min * 60
-            rad = self.secondsToRadian(secs)
-            x = int(self.TEXT_RADIUS * getX(secs))
-            y = int(self.TEXT_RADIUS * getY(secs))
-            textWidth = fontMetrics.width(str(min))
-            textHeight = fontMetrics.height()
-            textPath.addText(x - textWidth // 2, y + textHeight // 2, font, str(min))
-        painter.drawPath(textPath)
+        painter.setFont(font)
+        painter.setPen(self.themeColor('scale'))
+
+        labels = self._labelCache.labels(font, geometry,
+                                         painter.combinedTransform(),
+                                         painter.device().devicePixelRatioF())
+        for text, pos in labels:
+            painter.drawStaticText(pos, text)
         painter.restore()
 
     def drawClockHand(self, painter: QPainter) -> None:
-        secs = self.getEngineTime().getSeconds()
+        secs = self.getEngineTime().getMilliseconds() / 1000
 
         painter.save()
-        pen = QPen()
+        pen = QPen(self.themeColor('scale'))
         pen.setWidth(0)
         painter.setPen(pen)
-        painter.setBrush(QColor(255, 0, 0))
+        painter.setBrush(self.themeColor('hand'))
     
         path = QPainterPath()
         path.moveTo(0, 0)
         path.arcTo(-self.CIRCLE_RADIUS, -self.CIRCLE_RADIUS, 
                    2*self.CIRCLE_RADIUS, 2*self.CIRCLE_RADIUS, 
-                   90, -self.secondsToRadian(secs) * 180 / pi)
+                   90, -secs * 360 / 3600)
         path.lineTo(0, 0)
         painter.drawPath(path)
         painter.restore()
 
+    def drawTimeoutOverlay(self, painter: QPainter) -> None:
+        painter.save()
+        rect = QRectF(-self.CIRCLE_RADIUS, -80, 2 * self.CIRCLE_RADIUS, 160)
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(self.themeColor('overlay'))
+        painter.drawRoundedRect(rect, 40, 40)
+        font = painter.font()
+        font.setPointSize(40)
+        painter.setFont(font)
+        painter.setPen(self.themeColor('overlayText'))
+        painter.drawText(rect, Qt.AlignmentFlag.AlignCenter, "Timeout")
+        painter.restore()
+
+    def setCoalesceUpdates(self, coalesce: bool) -> None:
+        self._coalesceUpdates = coalesce
+
+    def coalesceUpdates(self) -> bool:
+        return self._coalesceUpdates
+
     def handleTimeChanged(self, time: Time) -> None:
+        secs = time.getMilliseconds() / 1000
+        if secs > 0 and self.isTimedOut():
+            self.setTimedOut(False)
+        prevSecs = self._handSeconds
+        self._handSeconds = secs
+        if not self._coalesceUpdates:
+            self.repaintNow()
+            return
+        # update() merges every request made before the next paint into a
+        # single paint event, so a drag storm costs at most one paint per frame.
+        if prevSecs is None:
+            self.requestPaint(self.rect())
+        elif prevSecs != secs:
+            self.requestPaint(self.handDirtyRect(prevSecs, secs))
+
+    def requestPaint(self, rect: QRect) -> None:
+        if self._paintPending:
+            metrics = activeMetrics()
+            if metrics:
+                # Merged into the paint that is already scheduled.
+                metrics.count('coalesced_updates')
+        self._paintPending = True
+        self.schedulePaint(rect)
+
+    def schedulePaint(self, rect: QRect) -> None:
+        self.update(rect)
+
+    def repaintNow(self) -> None:
         self.repaint()
 
+    def handDirtyRect(self, secs1: float, secs2: float) -> QRect:
+        # Only the sector between the old and the new hand position changes.
+        lo, hi = min(secs1, secs2), max(secs1, secs2)
+        geometry = self.getGeometry()
+        points = [(0, 0), geometry.pointAt(lo), geometry.pointAt(hi)]
+        for quarter in range(0, 3601, 900):
+            if lo < quarter < hi:
+                points.append(geometry.pointAt(quarter))
+
+        rect = self.clockRect()
+        side = min(rect.width(), rect.height())
+        scale = side / self.WINDOW_SIDE
+        x0 = rect.x() + (rect.width() - side) / 2 + self.WINDOW_SIDE / 2 * scale
+        y0 = rect.y() + (rect.height() - side) / 2 + self.WINDOW_SIDE / 2 * scale
+        xs = [x0 + x * scale for x, _ in points]
+        ys = [y0 + y * scale for _, y in points]
+        rect = QRectF(QPointF(min(xs), min(ys)), QPointF(max(xs), max(ys)))
+        return rect.toAlignedRect().adjusted(-2, -2, 2, 2)
+
     def handleTimeout(self) -> None:
-        QMessageBox.information(self, "Timeout", "Timeout")
+        # Shown as an overlay on the dial instead of a modal message box, which
+        # would run a nested event loop and stall every other timer.
+        self.setTimedOut(True)
+        if self._timeoutNotifier:
+            self._timeoutNotifier.notify(self)
 
-    def secondsToRadian(self, secs: int) -> float:
+    def isTimedOut(self) -> bool:
+        return self._timedOut
+
+    def setTimedOut(self, timedOut: bool) -> None:
+        if self._timedOut == timedOut:
+            return
+        self._timedOut = timedOut
+        self.requestPaint(self.clockRect())
+
+    def setTimeoutNotifier(self, notifier: TimeoutNotifier) -> None:
+        self._timeoutNotifier = notifier
+
+    def secondsToRadian(self, secs: float) -> float:
         return secs * pi / 1800
 
     def radianToSeconds(self, rad: float) -> int:
         return int((rad + pi) / pi * 1800)
 
     def posToSeconds(self, pos: QPoint) -> int:
-        pos_from_center = pos - self.rect().center()
+        pos_from_center = pos - self.clockRect().center()
         theta = atan2(-pos_from_center.x(), +pos_from_center.y())
         #print('theta:', theta)
         return self.radianToSeconds(theta)
 
+    def setThrottleDrag(self, throttle: bool) -> None:
+        self.flushDrag()
+        self._throttleDrag = throttle
+
+    def throttleDrag(self) -> bool:
+        return self._throttleDrag
+
+    def setDragSnap(self, secs: int) -> None:
+        self._dragSnap = max(1, secs)
+
+    def dragSnap(self) -> int:
+        return self._dragSnap
+
+    def snapSeconds(self, secs: int) -> int:
+        if self._dragSnap <= 1:
+            return secs
+        return round(secs / self._dragSnap) * self._dragSnap
+
+    def applyDragPos(self, pos: QPoint) -> None:
+        secs = self.snapSeconds(self.posToSeconds(pos))
+        prevTime = self.getEngineTime()
+
+        if prevTime.getSeconds() > 3600 - 300 and secs < 300:
+            secs = 3600
+        elif prevTime.getSeconds() < 300 and secs > 3600 - 300:
+            secs = 0
+
+        if prevTime.getMilliseconds() == secs * 1000:
+            # Nothing would change, do not bother the engine.
+            return
+        self.setEngineTime(Time(secs))
+
+    def flushDrag(self) -> None:
+        self._dragTimer.stop()
+        if self._pendingDragPos is None:
+            return
+        pos = self._pendingDragPos
+        self._pendingDragPos = None
+        self.applyDragPos(pos)
+
     def mousePressEvent(self, event: QMouseEvent) -> None:
         if event.button() == Qt.MouseButton.LeftButton:
-            if self.isPosInClock(event.pos()):
+            # A click acknowledges the timeout.
+            self.setTimedOut(False)
+            if self.isPosInClock(event.pos()) and not self.isEngineReadOnly():
                 if not self._dragging:
                     self._dragging = True
-                    self._engine.pause()
-                secs = self.posToSeconds(event.pos())
+                    self.getEngine().pause()
+                secs = self.snapSeconds(self.posToSeconds(event.pos()))
                 #print(secs)
                 self.setEngineTime(Time(secs))
 
@@ -225,28 +391,31 @@ class TimerView(AbstractTimerView):
 
     def mouseMoveEvent(self, event: QMouseEvent) -> None:
         if event.buttons() & Qt.MouseButton.LeftButton:
-            if self.isPosInClock(event.pos()):
+            if self.isPosInClock(event.pos()) and not self.isEngineReadOnly():
                 if not self._dragging:
                     self._dragging = True
-                    self._engine.pause()
+                    self.getEngine().pause()
 
             if self._dragging:
-                secs = self.posToSeconds(event.pos())
-                prevTime = self.getEngineTime()
-
-                if prevTime.getSeconds() > 3600 - 300 and secs < 300:
-                    self.setEngineTime(Time(3600))
-                elif prevTime.getSeconds() < 300 and secs > 3600 - 300:
-                    self.setEngineTime(Time(0))
+                if not self._throttleDrag:
+                    self.applyDragPos(event.pos())
                 else:
-                    self.setEngineTime(Time(secs))
+                    # Only the latest position of a frame reaches the engine.
+                    if self._pendingDragPos is not None:
+                        metrics = activeMetrics()
+                        if metrics:
+                            metrics.count('dropped_drag_events')
+                    self._pendingDragPos = QPoint(event.pos())
+                    if not self._dragTimer.isActive():
+                        self._dragTimer.start()
 
         return super().mouseMoveEvent(event)
 
     def mouseReleaseEvent(self, event: QMouseEvent) -> None:
         if event.button() == Qt.MouseButton.LeftButton:
             if self._dragging:
+                self.flushDrag()
                 self._dragging = False
-                self._engine.resume()
+                self.getEngine().resume()
 
-        return super().mouseReleaseEvent(event)
\ No newline at end of file
+        return super().mouseReleaseEvent(event)
@@ -0,0 +1,92 @@
+from minimaltimer.clock import Alarm, VirtualClock
+from minimaltimer.countdown import NS_PER_MSEC, Countdown
+from minimaltimer.time import Time
+
+NS_PER_SEC = 1000 * NS_PER_MSEC
+
+
+def drivenCountdown(interval: int = 1000) -> Countdown:
+    # Wires the countdown to a VirtualClock the way the engines do.
+    countdown = Countdown(interval, VirtualClock())
+    alarm = Alarm(countdown.clock(), countdown.tick)
+    countdown.scheduleChanged.connect(lambda: alarm.arm(countdown.nextWakeup()))
+    return countdown
+
+
+def record(countdown: Countdown) -> list:
+    events = []
+    countdown.timeValueChanged.connect(
+        lambda new, old: events.append((new.getMilliseconds(), old.getMilliseconds())))
+    countdown.timeout.connect(lambda: events.append('timeout'))
+    return events
+
+
+def test_ticks_once_per_interval_until_timeout():
+    countdown = drivenCountdown()
+    events = record(countdown)
+    countdown.setTime(Time(3))
+    assert countdown.clock().advance(10 * NS_PER_SEC) == 3
+    assert events == [(3000, 0), (2000, 3000), (1000, 2000), (0, 1000), 'timeout']
+    assert not countdown.isRunning()
+    assert countdown.nextWakeup() is None
+
+
+def test_ticks_land_on_boundaries_despite_lateness():
+    countdown = drivenCountdown()
+    countdown.setTime(Time(60))
+    countdown.clock().advance(30300 * NS_PER_MSEC, latenessNs=300 * NS_PER_MSEC)
+    # Every wakeup came 300 ms late, but the late wakeups do not add up.
+    assert countdown.getTime().getMilliseconds() == 30000
+    assert countdown.remainingNs() == 29700 * NS_PER_MSEC
+
+
+def test_pause_keeps_remaining_time_and_resume_continues():
+    countdown = drivenCountdown()
+    clock = countdown.clock()
+    countdown.setTime(Time(10))
+    clock.advance(2500 * NS_PER_MSEC)
+    countdown.pause()
+    assert countdown.remainingNs() == 7500 * NS_PER_MSEC
+    assert clock.pendingCount() == 0
+
+    clock.advance(60 * NS_PER_SEC)
+    assert countdown.getTime().getMilliseconds() == 8000
+    assert countdown.remainingNs() == 7500 * NS_PER_MSEC
+
+    countdown.resume()
+    clock.advance(500 * NS_PER_MSEC)
+    assert countdown.getTime().getMilliseconds() == 7000
+    clock.advance(7 * NS_PER_SEC)
+    assert countdown.getTime().getMilliseconds() == 0
+    assert not countdown.isRunning()
+
+
+def test_set_time_to_the_shown_value_restarts():
+    countdown = drivenCountdown()
+    events = record(countdown)
+    countdown.setTime(Time(5))
+    countdown.clock().advance(400 * NS_PER_MSEC)
+    countdown.setTime(Time(5))
+    assert countdown.remainingNs() == 5 * NS_PER_SEC
+    assert events == [(5000, 0)]
+
+
+def test_batch_update_merges_notifications():
+    countdown = drivenCountdown()
+    events = record(countdown)
+    with countdown.batchUpdate():
+        countdown.setTime(Time(10))
+        countdown.setTime(Time(20))
+        countdown.setTime(Time(0))
+        assert events == []
+    # Back at the value before the batch, nothing to report.
+    assert events == []
+
+    countdown.setTime(Time(1))
+    events.clear()
+    with countdown.batchUpdate():
+        countdown.clock().advance(NS_PER_SEC)
+        countdown.setTime(Time(2))
+    # One change from the value before the batch, the timeout inside it is
+    # still reported.
+    assert events == [(2000, 1000), 'timeout']
@@ -0,0 +1,110 @@
+import asyncio
+import sys
+import pytest
+from minimaltimer.daemon import TimerDaemon
+
+pytestmark = pytest.mark.skipif(sys.platform == 'win32',
+                                reason='the daemon serves a Unix domain socket')
+
+
+def runWithDaemon(tmp_path, client) -> None:
+    # Runs the coroutine client(reader, writer) connected to a daemon on a
+    # socket in tmp_path.
+    async def main() -> None:
+        daemon = TimerDaemon(str(tmp_path / 'timer.sock'))
+        await daemon.start()
+        try:
+            reader, writer = await asyncio.open_unix_connection(daemon.path())
+            try:
+                await asyncio.wait_for(client(reader, writer), 5)
+            finally:
+                writer.close()
+        finally:
+            daemon.close()
+    asyncio.run(main())
+
+
+async def send(writer, line: str) -> None:
+    writer.write(line.encode() + b'\n')
+    await writer.drain()
+
+
+async def request(reader, writer, line: str) -> str:
+    await send(writer, line)
+    return (await reader.readline()).decode()
+
+
+def test_malformed_commands_are_rejected(tmp_path):
+    async def client(reader, writer) -> None:
+        assert (await request(reader, writer, 'GET')).startswith('ERR')
+        assert await request(reader, writer, 'STOP tea') == 'ERR unknown command STOP\n'
+        assert await request(reader, writer, 'SET tea soon') == 'ERR SET expects milliseconds\n'
+        assert (await request(reader, writer, 'SET tea -5')).startswith('ERR')
+        # None of them created the timer.
+        assert await request(reader, writer, 'GET tea') == 'ERR unknown timer tea\n'
+    runWithDaemon(tmp_path, client)
+
+
+def test_only_set_and_sub_create_timers(tmp_path):
+    async def client(reader, writer) -> None:
+        for command in ('GET', 'PAUSE', 'RESUME', 'UNSUB'):
+            assert await request(reader, writer, f'{command} tea') == \
+                'ERR unknown timer tea\n'
+        assert await request(reader, writer, 'SUB tea') == 'TIME tea 0 0\n'
+        assert await request(reader, writer, 'GET tea') == 'TIME tea 0 0\n'
+    runWithDaemon(tmp_path, client)
+
+
+def test_set_is_acknowledged_after_its_state(tmp_path):
+    async def client(reader, writer) -> None:
+        assert await request(reader, writer, 'SUB tea') == 'TIME tea 0 0\n'
+        await send(writer, 'SET tea 5000 7')
+        assert await reader.readline() == b'TIME tea 5000 0\n'
+        assert await reader.readline() == b'OK tea 7\n'
+        await send(writer, 'PAUSE tea')
+        assert await reader.readline() == b'TIME tea 5000 1\n'
+        await send(writer, 'UNSUB tea')
+        assert await request(reader, writer, 'GET tea') == 'TIME tea 5000 1\n'
+    runWithDaemon(tmp_path, client)
+
+
+def test_subscribers_get_the_timeout(tmp_path):
+    async def client(reader, writer) -> None:
+        await request(reader, writer, 'SUB tea')
+        await send(writer, 'SET tea 20')
+        assert await reader.readline() == b'TIME tea 20 0\n'
+        assert await reader.readline() == b'TIME tea 0 0\n'
+        assert await reader.readline() == b'TIMEOUT tea\n'
+    runWithDaemon(tmp_path, client)
+
+
+def test_a_second_daemon_does_not_take_over_the_socket(tmp_path):
+    async def main() -> None:
+        path = str(tmp_path / 'timer.sock')
+        first = TimerDaemon(path)
+        await first.start()
+        second = TimerDaemon(path)
+        with pytest.raises(FileExistsError):
+            await second.start()
+        second.close()
+        # The first daemon still serves.
+        reader, writer = await asyncio.open_unix_connection(path)
+        assert await request(reader, writer, 'SET tea 1000 1') == 'OK tea 1\n'
+        writer.close()
+        first.close()
+    asyncio.run(main())
+
+
+def test_a_stale_socket_file_is_replaced(tmp_path):
+    path = tmp_path / 'timer.sock'
+    path.write_bytes(b'')
+
+    async def main() -> None:
+        daemon = TimerDaemon(str(path))
+        await daemon.start()
+        reader, writer = await asyncio.open_unix_connection(str(path))
+        assert await request(reader, writer, 'SUB tea') == 'TIME tea 0 0\n'
+        writer.close()
+        daemon.close()
+    asyncio.run(main())
+    assert not path.exists()
@@ -0,0 +1,79 @@
+from time import time_ns
+from minimaltimer.countdown import NS_PER_MSEC, Countdown
+from minimaltimer.persistence import TimerStateStore
+
+
+def test_load_falls_back_from_a_torn_slot(tmp_path):
+    path = str(tmp_path / 'timer.state')
+    store = TimerStateStore(path)
+    store.write(TimerStateStore.FLAG_PAUSED, 5000 * NS_PER_MSEC, 0)
+    store.write(TimerStateStore.FLAG_PAUSED, 7000 * NS_PER_MSEC, 0)
+    store.close()
+
+    # The second write went to slot 0, tear it in the middle.
+    with open(path, 'r+b') as f:
+        f.seek(TimerStateStore.SLOT_SIZE // 2)
+        f.write(b'\xff\xff\xff\xff')
+
+    store = TimerStateStore(path)
+    assert store.load() == (TimerStateStore.FLAG_PAUSED, 5000 * NS_PER_MSEC, 0)
+    # The next write replaces the torn slot, not the one still valid.
+    store.write(0, 3000 * NS_PER_MSEC, 0)
+    store.close()
+    store = TimerStateStore(path)
+    assert store.load() == (0, 3000 * NS_PER_MSEC, 0)
+    store.close()
+
+
+def test_both_slots_torn_loads_nothing(tmp_path):
+    path = tmp_path / 'timer.state'
+    path.write_bytes(b'\0' * 2 * TimerStateStore.SLOT_SIZE)
+    store = TimerStateStore(str(path))
+    assert store.load() is None
+    assert not store.restore(Countdown())
+    store.close()
+
+
+def test_restore_reports_a_timeout_that_happened_while_down(tmp_path):
+    path = str(tmp_path / 'timer.state')
+    store = TimerStateStore(path)
+    store.write(TimerStateStore.FLAG_RUNNING, 60000 * NS_PER_MSEC,
+                time_ns() - 1000 * NS_PER_MSEC)
+    store.close()
+
+    countdown = Countdown()
+    timeouts = []
+    countdown.timeout.connect(lambda: timeouts.append(True))
+    store = TimerStateStore(path)
+    assert store.restore(countdown)
+    store.close()
+    assert timeouts == [True]
+    assert countdown.getTime().getMilliseconds() == 0
+    assert not countdown.isRunning()
+
+
+def test_restore_continues_a_running_countdown(tmp_path):
+    path = str(tmp_path / 'timer.state')
+    store = TimerStateStore(path)
+    store.write(TimerStateStore.FLAG_RUNNING, 0, time_ns() + 60000 * NS_PER_MSEC)
+    store.close()
+
+    countdown = Countdown()
+    store = TimerStateStore(path)
+    assert store.restore(countdown)
+    store.close()
+    assert countdown.isRunning()
+    assert countdown.getTime().getMilliseconds() == 60000
+
+
+def test_closed_store_does_not_write(tmp_path):
+    path = str(tmp_path / 'timer.state')
+    countdown = Countdown()
+    store = TimerStateStore(path)
+    store.attach(countdown)
+    store.close()
+    countdown.pause()
+    store.write(0, 1, 0)
+    store = TimerStateStore(path)
+    assert store.load() is None
+    store.close()
@@ -0,0 +1,74 @@
+import random
+import pytest
+import minimaltimer.timerstore
+from minimaltimer.clock import VirtualClock
+from minimaltimer.countdown import NS_PER_MSEC
+from minimaltimer.time import Time
+from minimaltimer.timerstore import TimerStore
+
+
+def runStore(seed: int) -> list:
+    # Drives a store with random timers on a virtual clock and records every
+    # notification and wakeup.
+    rng = random.Random(seed)
+    clock = VirtualClock()
+    store = TimerStore(200, resolution=20, clock=clock)
+    log = []
+    store.timeChanged.connect(
+        lambda indices: log.append(('changed', clock.now(), sorted(indices),
+                                    [store.getTime(i).getMilliseconds()
+                                     for i in sorted(indices)])))
+    store.timeout.connect(lambda indices: log.append(('timeout', clock.now(),
+                                                      sorted(indices))))
+    timers = [store.add(Time(msecs=rng.randrange(0, 30000))) for _ in range(150)]
+    for step in range(400):
+        clock.advance(rng.randrange(1, 300) * NS_PER_MSEC)
+        if store.nextWakeup() is not None and store.nextWakeup() <= clock.now():
+            store.tick()
+        timer = rng.choice(timers)
+        action = rng.random()
+        if action < 0.05:
+            timer.pause()
+        elif action < 0.1:
+            timer.resume()
+        elif action < 0.12:
+            timer.setTime(Time(msecs=rng.randrange(0, 30000)))
+        log.append(('wakeup', store.nextWakeup(), store.runningCount()))
+    return log
+
+
+def test_numpy_and_loop_give_the_same_results(monkeypatch):
+    pytest.importorskip('numpy')
+    vectorized = runStore(1)
+    monkeypatch.setattr(minimaltimer.timerstore, 'numpy', None)
+    assert runStore(1) == vectorized
+
+
+def test_stored_timer_counts_down_and_times_out():
+    clock = VirtualClock()
+    store = TimerStore(4, clock=clock)
+    timer = store.add(Time(2))
+    values = []
+    timer.timeValueChanged.connect(
+        lambda new, old: values.append((new.getMilliseconds(), old.getMilliseconds())))
+    timeouts = []
+    timer.timeout.connect(lambda: timeouts.append(clock.now()))
+    while store.nextWakeup() is not None:
+        clock.advanceTo(store.nextWakeup())
+        store.tick()
+    assert values == [(1000, 2000), (0, 1000)]
+    assert timeouts == [2000 * NS_PER_MSEC]
+    assert not timer.isRunning()
+
+
+def test_full_store_and_removed_slots():
+    store = TimerStore(2, clock=VirtualClock())
+    first = store.add(Time(1))
+    store.add(Time(1))
+    with pytest.raises(IndexError):
+        store.add()
+    store.remove(first.index())
+    assert store.runningCount() == 1
+    with pytest.raises(IndexError):
+        store.getTime(first.index())
+    assert store.add().index() == first.index()